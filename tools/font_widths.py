@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+
+# SPDX-License-Identifier: LGPL-3.0-or-later
+# Copyright (C) 2020 Daniel Thompson
+
+"""Add an advance width table to fonts generated by font_to_py.py.
+
+Looking up a glyph just to find out how wide it is requires a memoryview
+slice and a tuple to be allocated. This tool adds a compact table of
+advance widths (the glyph width plus the one pixel of spacing that
+draw565 places after every glyph) to a font module so that text can be
+measured without allocating any memory.
+
+The table is indexed in the same way as the font's own index. Entry 0 is
+the width of the glyph used for characters missing from the font and
+entry n is the width of ``chr(min_ch() + n - 1)``.
+
+The tool can safely be re-run on a font that already has a width table.
+"""
+
+import argparse
+import re
+
+def widths(fname):
+    """Calculate the advance width table for a font module."""
+    font = {}
+    with open(fname) as f:
+        exec(f.read(), font)
+
+    lo = font['min_ch']()
+    hi = font['max_ch']()
+    chars = [ chr(0) ] + [ chr(i) for i in range(lo, hi + 1) ]
+
+    table = bytearray()
+    for ch in chars:
+        w = font['get_ch'](ch)[2] + 1
+        if w > 255:
+            raise ValueError('{}: glyph too wide'.format(fname))
+        table.append(w)
+    return bytes(table)
+
+def render(table):
+    """Render a width table in the same style as the font data."""
+    lines = [ '_widths =' ]
+    for i in range(0, len(table), 16):
+        row = ''.join('\\x{:02x}'.format(b) for b in table[i:i+16])
+        lines.append("b'{}'".format(row))
+    return '\\\n'.join(lines) + '\n\ndef widths():\n    return _widths\n\n'
+
+def update(fname):
+    with open(fname) as f:
+        src = f.read()
+
+    # Remove any existing table
+    src = re.sub(r"_widths =\\\n(b'[^']*'\\?\n)*\ndef widths\(\):\n    return _widths\n\n",
+                 '', src)
+
+    marker = '_mvfont = memoryview(_font)'
+    if marker not in src:
+        raise ValueError('{}: not generated by font_to_py.py'.format(fname))
+    src = src.replace(marker, render(widths(fname)) + marker)
+
+    with open(fname, 'w') as f:
+        f.write(src)
+
+def main():
+    parser = argparse.ArgumentParser(
+            description='Add an advance width table to a font module')
+    parser.add_argument('files', nargs='+',
+            help='Font module generated by font_to_py.py')
+    args = parser.parse_args()
+
+    for fname in args.files:
+        update(fname)
+
+if __name__ == '__main__':
+    main()
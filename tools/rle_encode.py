@@ -220,53 +220,87 @@ def encode_2bit(im):
 
     return bytes(rle)
 
-def encode_8bit(im):
-    """Experimental 8-bit RLE encoder.
-
-    For monochrome images this is about 3x less efficient than the 1-bit
-    encoder. This encoder is not currently used anywhere in wasp-os and
-    currently there is no decoder either (so don't assume this code
-    actually works).
+def encode_indexed(im, depth):
+    """Indexed colour (4-bit or 8-bit) RLE encoder.
+
+    Every pixel is mapped to the closest colour in the wasp-os CLUT and the
+    image then carries a palette of up to 16 (4-bit) or 256 (8-bit) of
+    these colours. If a 4-bit image uses more than 16 colours then the
+    least frequently used colours are replaced with the closest colour
+    that is in the palette.
+
+    This encoding is much more compact than the 2-bit encoding for
+    images with many colours because changing colour costs nothing more
+    than coding a new run.
     """
     pixels = im.load()
+    assert(im.width <= 255)
+    assert(im.height <= 255)
+    assert(depth in (4, 8))
 
-    rle = []
-    rl = 0
-    px = pixels[0, 0]
+    full_palette = ReverseCLUT(clut8_rgb888)
+    indices = []
+    for y in range(im.height):
+        for x in range(im.width):
+            px = pixels[x, y]
+            indices.append(full_palette((px[0] << 16) + (px[1] << 8) + px[2]))
+
+    # Choose the palette, most frequently used colours first
+    counts = {}
+    for i in indices:
+        counts[i] = counts.get(i, 0) + 1
+    palette = sorted(counts, key=lambda i: -counts[i])[:1 << depth]
+
+    # Map any colours that did not make it into the palette to the
+    # closest colour that did
+    def distance(a, b):
+        a = clut8_rgb888(a)
+        b = clut8_rgb888(b)
+        rd = (a >> 16) - (b >> 16)
+        gd = ((a >> 8) & 0xff) - ((b >> 8) & 0xff)
+        bd = (a & 0xff) - (b & 0xff)
+        return rd * rd + gd * gd + bd * bd
+
+    lookup = {}
+    for i in counts:
+        lookup[i] = min(range(len(palette)),
+                        key=lambda j: distance(i, palette[j]))
+
+    rle = [ depth, im.width, im.height, len(palette) & 0xff ] + palette
 
     def encode_pixel(px, rl):
-        px = (px[0] & 0xe0) | ((px[1] & 0xe0) >> 3) | ((px[2] & 0xc0) >> 6)
-
-        rle.append(px)
-        if rl > 0:
+        if depth == 4:
+            if rl < 15:
+                rle.append((px << 4) + rl)
+                return
+            rle.append((px << 4) + 15)
+            rl -= 15
+        else:
             rle.append(px)
-        rl -= 2
-        if rl > (1 << 14):
-            rle.append(0x80 | ((rl >> 14) & 0x7f))
-        if rl > (1 <<  7):
-            rle.append(0x80 | ((rl >>  7) & 0x7f))
-        if rl >= 0:
-            rle.append(         rl        & 0x7f )
+        while rl >= 255:
+            rle.append(255)
+            rl -= 255
+        rle.append(rl)
 
-    for y in range(im.height):
-        for x in range(im.width):
-            newpx = pixels[x, y]
-            if newpx == px:
-                rl += 1
-                assert(rl < (1 << 21))
-                continue
+    rl = 0
+    px = lookup[indices[0]]
+    for i in indices:
+        newpx = lookup[i]
+        if newpx == px:
+            rl += 1
+            continue
 
-            # Code the previous run
-            encode_pixel(px, rl)
+        # Code the previous run
+        encode_pixel(px, rl)
 
-            # Start a new run
-            rl = 1
-            px = newpx
+        # Start a new run
+        rl = 1
+        px = newpx
 
     # Handle the final run
     encode_pixel(px, rl)
 
-    return (im.width, im.height, bytes(rle))
+    return bytes(rle)
 
 def render_c(image, fname, indent, depth):
     extra_indent = ' ' * indent
@@ -360,16 +394,19 @@ parser.add_argument('--1bit', action='store_const', const=1, dest='depth',
                     help='Generate 1-bit image')
 parser.add_argument('--2bit', action='store_const', const=2, dest='depth',
                     help='Generate 2-bit image')
+parser.add_argument('--4bit', action='store_const', const=4, dest='depth',
+                    help='Generate 4-bit indexed colour image')
 parser.add_argument('--8bit', action='store_const', const=8, dest='depth',
-                    help='Generate 8-bit image')
+                    help='Generate 8-bit indexed colour image')
 
 args = parser.parse_args()
 
 if args.clut:
     print(f'{args.clut} maps to {clut8_rgb888(args.clut):06x} (RGB888) or {clut8_rgb565(args.clut):04x} (RGB565)')
 
-if args.depth == 8:
-    encoder = encode_8bit
+if args.depth in (4, 8):
+    depth = args.depth
+    encoder = lambda im: encode_indexed(im, depth)
 elif args.depth == 2:
     encoder = encode_2bit
 elif args.depth == 1:
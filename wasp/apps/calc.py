@@ -56,8 +56,11 @@ class CalculatorApp():
         self.output = ""
 
     def foreground(self):
+        draw = wasp.watch.drawable
+        draw.begin()
         self._draw()
         self._update()
+        draw.commit()
         wasp.system.request_event(wasp.EventMask.TOUCH)
 
     def touch(self, event):
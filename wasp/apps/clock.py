@@ -33,15 +33,20 @@ class ClockApp():
         tick callback every second.
         """
         wasp.system.bar.clock = False
+        self._always_on = False
         self._draw(True)
         wasp.system.request_tick(1000)
 
     def sleep(self):
         """Prepare to enter the low power mode.
 
+        If the system manager permits it then the digits are kept on
+        display whilst the watch is asleep.
+
         :returns: True, which tells the system manager not to automatically
                   switch to the default application before sleeping.
         """
+        self._always_on = wasp.system.request_always_on(80, 60)
         return True
 
     def wake(self):
@@ -51,11 +56,18 @@ class ClockApp():
         udpate the display (but there is no need for a full redraw because
         the display RAM is preserved during a sleep.
         """
+        self._always_on = False
         self._draw()
 
     def tick(self, ticks):
         """Periodic callback to update the display."""
-        self._draw()
+        if self._always_on:
+            # Only the digits are visible so there is no need to update
+            # anything else (and we deliberately leave self._min alone
+            # so everything gets updated when we wake)
+            self._draw_digits(wasp.watch.rtc.get_localtime())
+        else:
+            self._draw()
 
     def preview(self):
         """Provide a preview for the watch face selection."""
@@ -102,12 +114,20 @@ class ClockApp():
                 return
 
         # Draw the changeable parts of the watch face
-        draw.blit(DIGITS[now[4]  % 10], 4*48, 80, fg=hi)
-        draw.blit(DIGITS[now[4] // 10], 3*48, 80, fg=lo)
-        draw.blit(DIGITS[now[3]  % 10], 1*48, 80, fg=hi)
-        draw.blit(DIGITS[now[3] // 10], 0*48, 80, fg=lo)
+        self._draw_digits(now)
         draw.set_color(hi)
         draw.string(self._day_string(now), 0, 180, width=240)
 
         # Record the minute that is currently being displayed
         self._min = now[4]
+
+    def _draw_digits(self, now):
+        """Draw the hours and minutes."""
+        draw = wasp.watch.drawable
+        hi =  wasp.system.theme('bright')
+        lo =  wasp.system.theme('mid')
+
+        draw.blit(DIGITS[now[4]  % 10], 4*48, 80, fg=hi)
+        draw.blit(DIGITS[now[4] // 10], 3*48, 80, fg=lo)
+        draw.blit(DIGITS[now[3]  % 10], 1*48, 80, fg=hi)
+        draw.blit(DIGITS[now[3] // 10], 0*48, 80, fg=lo)
@@ -31,13 +31,12 @@ class PagerApp():
 
     def background(self):
         """De-activate the application."""
-        self._chunks = None
-        self._numpages = None
+        self._pages = None
 
     def swipe(self, event):
         """Swipe to page up/down."""
         if event[0] == wasp.EventType.UP:
-            if self._page >= self._numpages:
+            if not self._more:
                 wasp.system.navigate(wasp.EventType.BACK)
                 return
             self._page += 1
@@ -51,30 +50,43 @@ class PagerApp():
     def _redraw(self):
         """Redraw from scratch (jump to the first page)"""
         self._page = 0
-        self._chunks = wasp.watch.drawable.wrap(self._msg, 240)
-        self._numpages = (len(self._chunks) - 2) // 9
+        self._pages = [ 0, ]
         self._draw()
 
     def _draw(self):
-        """Draw a page from scratch."""
+        """Draw a page from scratch.
+
+        The message is wrapped lazily, one page at a time, and the start
+        of each page is remembered so that we can page back up without
+        wrapping the message again.
+        """
         mute = wasp.watch.display.mute
         draw = wasp.watch.drawable
+        msg = self._msg
 
         mute(True)
         draw.set_color(0xffff)
         draw.fill()
 
+        # Each page shows up to ten lines and the last line is repeated
+        # at the top of the following page
         page = self._page
-        i = page * 9
-        j = i + 11
-        chunks = self._chunks[i:j]
-        for i in range(len(chunks)-1):
-            sub = self._msg[chunks[i]:chunks[i+1]].rstrip()
-            draw.string(sub, 0, 24*i)
+        pages = self._pages
+        start = pages[page]
+        n = 0
+        for end in draw.wrap_iter(msg, 240, start):
+            if n == 9 and len(pages) == page + 1:
+                pages.append(start)
+            draw.string(msg[start:end].rstrip(), 0, 24*n)
+            start = end
+            n += 1
+            if n >= 10:
+                break
+        self._more = n >= 10
 
         scroll = self._scroll
         scroll.up = page > 0
-        scroll.down = page < self._numpages
+        scroll.down = self._more
         scroll.draw()
 
         mute(False)
@@ -13,6 +13,7 @@ number 2048.
 """
 
 import wasp
+import draw565
 import icons
 import widgets
 import random
@@ -82,6 +83,7 @@ class Play2048App():
         self._board = None
         self._state = 0
         self._confirmation_view = None
+        self._canvas = None
 
     def foreground(self):
         """Activate the application."""
@@ -91,11 +93,23 @@ class Play2048App():
 
         self._state = 0
 
+        # Tiles are composed off-screen (if there is enough RAM) so that
+        # the label and background reach the display together
+        try:
+            self._canvas = draw565.Canvas(wasp.watch.display, 0, 0,
+                                          CELL_SIZE, CELL_SIZE)
+        except MemoryError:
+            self._canvas = None
+
         if not self._board:
             self._start_game()
 
         self._draw()
 
+    def background(self):
+        """De-activate the application."""
+        self._canvas = None
+
     def touch(self,event):
         """Notify the application of a touchscreen touch event."""
         if self._state == 0:
@@ -141,9 +155,15 @@ class Play2048App():
         """Update the specified cell of the application display."""
         x = GRID_PADDING + (col * (CELL_SIZE + GRID_PADDING))
         y = GRID_PADDING + (row * (CELL_SIZE + GRID_PADDING))
+        canvas = self._canvas
+        if canvas:
+            canvas.move(x, y)
+            draw = canvas
         draw.set_color(CELL_FOREGROUND[cell], CELL_BACKGROUND[cell])
         draw.fill(CELL_BACKGROUND[cell], x, y, CELL_SIZE, CELL_SIZE)
         draw.string(CELL_LABEL[cell], x, y + 16, CELL_SIZE)
+        if canvas:
+            canvas.flush()
 
     def _start_game(self):
         """Start a new game."""
@@ -73,7 +73,10 @@ class SettingsApp():
         elif self._current_setting == 'Units':
             if self._units_toggle.touch(event):
                 wasp.system.units = self._units[(self._units.index(wasp.system.units) + 1) % len(self._units)]
+        draw = wasp.watch.drawable
+        draw.begin()
         self._update()
+        draw.commit()
 
     def swipe(self, event):
         """Handle NEXT events by augmenting the default processing by resetting
@@ -94,6 +97,7 @@ class SettingsApp():
         mute = wasp.watch.display.mute
         self._current_setting = self._settings[self._sett_index % len(self._settings)]
         mute(True)
+        draw.begin()
         draw.fill()
         draw.set_color(wasp.system.theme('bright'))
         draw.set_font(fonts.sans24)
@@ -124,6 +128,7 @@ class SettingsApp():
             self._units_toggle.draw()
         self._scroll_indicator.draw()
         self._update()
+        draw.commit()
         mute(False)
 
     def _update(self):
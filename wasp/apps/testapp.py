@@ -26,7 +26,7 @@ class TestApp():
     ICON = icons.app
 
     def __init__(self):
-        self.tests = ('Alarm', 'Button', 'Checkbox', 'Crash', 'Colours', 'Fill', 'Fill-H', 'Fill-V', 'Free Mem', 'Line', 'Notifications', 'RLE', 'String', 'Touch', 'Wrap')
+        self.tests = ('Alarm', 'Button', 'Checkbox', 'Crash', 'Colours', 'Fill', 'Fill-H', 'Fill-V', 'Free Mem', 'Line', 'Notifications', 'RLE', 'Shapes', 'String', 'Touch', 'Wrap')
         self.test = self.tests[0]
         self.scroll = wasp.widgets.ScrollIndicator()
 
@@ -54,6 +54,8 @@ class TestApp():
             draw.string('{}: {}'.format(button, state), 0, 108, width=240)
         elif self.test == 'Crash':
             self.crash()
+        elif self.test == 'Shapes':
+            self._benchmark_shapes()
         elif self.test == 'String':
             self._benchmark_string()
         elif self.test == 'Touch':
@@ -137,7 +139,12 @@ class TestApp():
         elapsed = t.time()
         t.stop()
         del t
-        draw.string('{}s'.format(elapsed / 1000000), 12, 24+192)
+
+        # Report the decode rate as well as the time taken
+        pixels = 8 * icons.software[1] * icons.software[2]
+        draw.string('{}s'.format(elapsed / 1000000), 12, 24+168)
+        draw.string('{} kpx/s'.format(pixels * 1000 // max(elapsed, 1)),
+                    12, 24+192)
 
     def _benchmark_fill(self):
         draw = wasp.watch.drawable
@@ -163,6 +170,22 @@ class TestApp():
         del t
         draw.string('{}s'.format(elapsed / 1000000), 12, 24+192)
 
+    def _benchmark_shapes(self):
+        draw = wasp.watch.drawable
+        draw.fill(0, 0, 30, 240, 240-30)
+        self.scroll.draw()
+        t = machine.Timer(id=1, period=8000000)
+        t.start()
+        draw.rounded_rect(30, 40, 180, 140, 16, 0, 0x4208)
+        draw.circle(120, 110, 60, 0, 0x001f)
+        draw.arc(120, 110, 56, 0, 240, 10, 0x07e0)
+        draw.arc(120, 110, 40, 240, 360, 0, 0xfb00)
+        draw.polygon(((120, 70), (150, 130), (90, 130)), 0, 0xffe0)
+        elapsed = t.time()
+        t.stop()
+        del t
+        draw.string('{}s'.format(elapsed / 1000000), 12, 24+192)
+
     def _benchmark_string(self):
         draw = wasp.watch.drawable
         draw.fill(0, 0, 30, 240, 240-30)
@@ -196,8 +219,18 @@ class TestApp():
             draw.line(120, 120, 120-y, 120+x, 2, 0xffe0)  # yellow
         elapsed = t.time()
         t.stop()
+
+        # Draw the same lines again as a batch (one batch per colour)
+        t.start()
+        draw.lines([(120, 120, 120+x, 120+y) for x, y in points], 4, 0xfb00)
+        draw.lines([(120, 120, 120+y, 120-x) for x, y in points], 3, 0x07c0)
+        draw.lines([(120, 120, 120-x, 120-y) for x, y in points], 5, 0x6b3f)
+        draw.lines([(120, 120, 120-y, 120+x) for x, y in points], 2, 0xffe0)
+        batched = t.time()
+        t.stop()
         del t
-        draw.string('{}s'.format(elapsed / 1000000), 12, 24+192)
+        draw.string('{}s'.format(elapsed / 1000000), 12, 24+168)
+        draw.string('{}s'.format(batched / 1000000), 12, 24+192)
 
     def _benchmark_wrap(self):
         draw = wasp.watch.drawable
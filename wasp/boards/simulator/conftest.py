@@ -1,15 +1,39 @@
 import glob
 import importlib
 import inspect
+import os
 import pytest
 
+# Each pytest-xdist worker is a separate process with its own simulated
+# watch. Nobody can see the workers' windows so run them headless.
+worker = os.environ.get('PYTEST_XDIST_WORKER')
+if worker:
+    os.environ.setdefault('WASP_SIM_HEADLESS', '1')
+
+import instance
+sim = instance.Instance(worker if worker else 'main')
+
+def pytest_collection_finish(session):
+    # Wait until the tests have been collected (the paths being collected
+    # may be relative to the directory pytest was started from)
+    sim.start()
+
+def pytest_unconfigure(config):
+    if sim.sandbox:
+        sim.stop()
+
+@pytest.fixture(autouse=True)
+def simulator():
+    yield sim
+    sim.reset()
+
 def discover_app_constructors():
     apps = []
 
-    globs_system = glob.glob('wasp/apps/*.py')
-    names_system = [ g[5:-3].replace('/', '.') for g in globs_system ]
-    globs_user = glob.glob('apps/*.py')
-    names_user = [ g[:-3].replace('/', '.') for g in globs_user ]
+    globs_system = glob.glob(os.path.join(instance.ROOT, 'wasp/apps/*.py'))
+    names_system = [ 'apps.' + os.path.basename(g)[:-3] for g in globs_system ]
+    globs_user = glob.glob(os.path.join(instance.ROOT, 'apps/*.py'))
+    names_user = [ 'apps.' + os.path.basename(g)[:-3] for g in globs_user ]
     modules = [ importlib.import_module(n) for n in names_system + names_user ]
 
     for m in modules:
@@ -6,24 +6,58 @@
 import warnings
 warnings.simplefilter("ignore", lineno=58)
 
+import os
 import sys
-import sdl2
-import sdl2.ext
+import time
 import numpy as np
 from PIL import Image
 import wasp
 
+# Set WASP_SIM_HEADLESS to run the simulator without a window (and without
+# needing SDL at all). The panel is kept in a numpy array instead and input
+# events can only be injected programmatically (see inject()).
+HEADLESS = bool(os.environ.get('WASP_SIM_HEADLESS'))
+if not HEADLESS:
+    import sdl2
+    import sdl2.ext
+
+# Drawing only marks the window as dirty and the window is presented (at
+# most) once per tick. Set WASP_SIM_FPS to limit the presentation rate
+# further or WASP_SIM_SHOW_WRITES to present after every write to the
+# display (which is slow but useful to watch how a screen is drawn).
+FPS = int(os.environ.get('WASP_SIM_FPS', 0))
+SHOW_WRITES = bool(os.environ.get('WASP_SIM_SHOW_WRITES'))
+
+PTLON = 0x12
+NORON = 0x13
 DISPOFF = 0x28
 DISPON = 0x29
 CASET = 0x2a
 RASET = 0x2b
 RAMWR = 0x2c
+PTLAR = 0x30
+VSCRDEF = 0x33
+VSCSAD = 0x37
+IDMOFF = 0x38
+IDMON = 0x39
+COLMOD = 0x3a
 
 WIDTH = 240
 HEIGHT = 240
 
+# The ST7789 frame memory has more lines than the panel
+FRAME_LINES = 320
+
+# Estimated overheads, in microseconds, of driving the display from the real
+# device. These are charged on top of the time taken to clock each byte out
+# of the SPI bus at the configured baud rate.
+TRANSFER_US = 12
+COMMAND_US = 4
+SELECT_US = 3
+
 SKIN = {
-    'fname' : 'res/simulator_skin.png',
+    'fname' : os.path.join(os.path.dirname(__file__), '..', '..', '..',
+                           'res', 'simulator_skin.png'),
     'size' : (337, 427),
     'button_profile' : 9,
     'offset' : (53, 93)
@@ -39,25 +73,133 @@ class ST7789Sim(object):
         self.cmd = 0
         self.mute = False
 
+        # Frame memory (in RGB888 format) and vertical scrolling state
+        self.ram = np.zeros((WIDTH, FRAME_LINES), dtype=np.uint32)
+        self.scroll_area = (0, FRAME_LINES, 0)
+        self.vsp = 0
+
+        # Pixel format (and any part of a pixel left over from a write)
+        self.depth = 16
+        self.pending = b''
+
+        # Estimated time the real device would have spent driving the
+        # display (see transfer() and select())
+        self.busy_us = 0.0
+
+        # Low power modes
+        self.partial_area = (0, FRAME_LINES - 1)
+        self.partial = False
+        self.idle = False
+
+    def display_row(self, row):
+        """Find the display line that shows a line of frame memory.
+
+        :param row: Line of frame memory (or a numpy array of lines)
+        """
+        (tfa, vsa, bfa) = self.scroll_area
+        return np.where((row >= tfa) & (row < tfa + vsa),
+                        tfa + (row - self.vsp) % vsa, row)
+
+    def redraw(self):
+        """Redraw the whole panel from the frame memory."""
+        rows = np.arange(FRAME_LINES)
+        lines = self.display_row(rows)
+        shown = lines < HEIGHT
+        rows = rows[shown]
+        lines = lines[shown]
+
+        pixels = self.ram[:, rows]
+        if self.idle:
+            # Idle mode uses only the MSB of each colour channel
+            pixels = ((pixels & 0x808080) >> 7) * 0xff
+        if self.partial:
+            # Lines outside the partial area are not shown
+            (start, end) = self.partial_area
+            pixels[:, (lines < start) | (lines > end)] = 0
+
+        (x, y) = SKIN['adjust']
+        pixelview = pixels2d(windowsurface)
+        pixelview[x:x+WIDTH, y + lines] = pixels
+        del pixelview
+        if not self.mute:
+            refresh()
+
+    def decode(self, data):
+        """Convert pixel data into an array of RGB888 values.
+
+        In 12-bit mode the RGB444 values are expanded to RGB565 by
+        repeating the most significant bits of each colour channel.
+        """
+        data = self.pending + bytes(data)
+        if self.depth == 12:
+            n = len(data) - len(data) % 3
+            self.pending = data[n:]
+
+            b = np.frombuffer(data, dtype=np.uint8, count=n).reshape(-1, 3)
+            b = b.astype(np.uint32)
+            rgb = np.stack((b[:, 0] >> 4, b[:, 0] & 0xf, b[:, 1] >> 4,
+                            b[:, 1] & 0xf, b[:, 2] >> 4, b[:, 2] & 0xf),
+                           axis=1).reshape(-1, 3)
+            (r, g, b) = (rgb[:, 0], rgb[:, 1], rgb[:, 2])
+            rgb565 = ((((r << 1) | (r >> 3)) << 11) +
+                      (((g << 2) | (g >> 2)) << 5) +
+                       ((b << 1) | (b >> 3)))
+        else:
+            n = len(data) & ~1
+            self.pending = data[n:]
+            rgb565 = np.frombuffer(data, dtype='>u2', count=n // 2)
+            rgb565 = rgb565.astype(np.uint32)
+
+        return (((rgb565 & 0xf800) << 8) +
+                ((rgb565 & 0x07e0) << 5) +
+                ((rgb565 & 0x001f) << 3))
+
+    def transfer(self, nbytes, baudrate):
+        """Charge the cost of an SPI transfer to the estimated device time."""
+        self.busy_us += TRANSFER_US + nbytes * 8000000 / baudrate
+
+    def select(self):
+        """Charge the cost of a chip select cycle to the estimated device time."""
+        self.busy_us += SELECT_US
+
     def write(self, data):
         # Converting data to a memoryview ensures we act more like spi.write()
         # when running in a real device (e.g. data must be  bytes-like object
         # that implements the buffer protocol)
         data = memoryview(data)
 
-        if len(data) == 1:
+        if self.cmd == COLMOD and len(data) == 1:
+            # This is the only single byte parameter we need to decode
+            self.depth = 12 if (data[0] & 7) == 3 else 16
+            self.cmd = 0
+
+        elif len(data) == 1:
             # Assume if we get a byte at a time then it is command.
             # This is a simplification do we don't have to track
             # the D/C pin from within the simulator.
             cmd = data[0]
+            self.busy_us += COMMAND_US
             if cmd == DISPOFF:
                 self.mute = True
             elif cmd == DISPON:
                 self.mute = False
-                window.refresh()
+                refresh()
+            elif cmd in (PTLON, NORON):
+                self.partial = cmd == PTLON
+                self.redraw()
+            elif cmd in (IDMON, IDMOFF):
+                self.idle = cmd == IDMON
+                self.redraw()
             else:
                 self.cmd = data[0]
 
+                # Starting a RAM write resets the address pointers to
+                # the start of the window
+                if cmd == RAMWR:
+                    self.x = self.colclip[0]
+                    self.y = self.rowclip[0]
+                    self.pending = b''
+
         elif self.cmd == CASET:
             self.colclip[0] = (data[0] << 8) + data[1]
             assert(self.colclip[0] >= 0 and self.colclip[0] <= 240)
@@ -67,46 +209,77 @@ class ST7789Sim(object):
 
         elif self.cmd == RASET:
             self.rowclip[0] = (data[0] << 8) + data[1]
-            assert(self.rowclip[0] >= 0 and self.rowclip[0] <= 240)
+            assert(self.rowclip[0] >= 0 and self.rowclip[0] < FRAME_LINES)
             self.rowclip[1] = (data[2] << 8) + data[3]
-            assert(self.rowclip[1] >= 0 and self.rowclip[1] <= 240)
+            assert(self.rowclip[1] >= 0 and self.rowclip[1] < FRAME_LINES)
             self.y = self.rowclip[0]
 
+        elif self.cmd == PTLAR:
+            start = (data[0] << 8) + data[1]
+            end = (data[2] << 8) + data[3]
+            assert(start <= end < FRAME_LINES)
+            self.partial_area = (start, end)
+            if self.partial:
+                self.redraw()
+
+        elif self.cmd == VSCRDEF:
+            tfa = (data[0] << 8) + data[1]
+            vsa = (data[2] << 8) + data[3]
+            bfa = (data[4] << 8) + data[5]
+            assert(tfa + vsa + bfa == FRAME_LINES)
+            self.scroll_area = (tfa, vsa, bfa)
+            self.redraw()
+
+        elif self.cmd == VSCSAD:
+            self.vsp = (data[0] << 8) + data[1]
+            assert(self.vsp < FRAME_LINES)
+            self.redraw()
+
         elif self.cmd == RAMWR:
-            #pixelview = sdl2.ext.PixelView(windowsurface)
-            pixelview = sdl2.ext.pixels2d(windowsurface)
-
-            half = False
-            for d in data:
-                if not half:
-                    rgb = d << 8
-                    half = True
-                    continue
-                rgb |= d
-                half = False
-
-                #pixel = ((rgb & 0xf800) >> 8,
-                #         (rgb & 0x07e0) >> 3,
-                #         (rgb & 0x001f) << 3)
-                pixel = (((rgb & 0xf800) << 8) +
-                         ((rgb & 0x07e0) << 5) +
-                         ((rgb & 0x001f) << 3))
-            
-                pv_x = self.x + SKIN['adjust'][0]
-                pv_y = self.y + SKIN['adjust'][1]
-                pixelview[pv_x][pv_y] = pixel
-
-                self.x += 1
-                if self.x > self.colclip[1]:
-                    self.x = self.colclip[0]
-                    self.y += 1
-                if self.y > self.rowclip[1]:
-                    self.y = self.rowclip[0]
-            
+            pixels = self.decode(data)
+            (x0, x1) = self.colclip
+            (y0, y1) = self.rowclip
+            width = x1 - x0 + 1
+            size = width * (y1 - y0 + 1)
+
+            # Work out where each pixel goes (the address pointers wrap at
+            # the edges of the window). If there is more data than will fit
+            # in the window then only the last pixels written will remain.
+            start = (self.y - y0) * width + (self.x - x0)
+            if len(pixels) > size:
+                start += len(pixels) - size
+                pixels = pixels[-size:]
+            pos = (start + np.arange(len(pixels))) % size
+            cols = x0 + pos % width
+            rows = y0 + pos // width
+
+            end = (start + len(pixels)) % size
+            self.x = x0 + end % width
+            self.y = y0 + end // width
+
+            # Columns beyond the edge of the panel are discarded
+            visible = cols < WIDTH
+            if not visible.all():
+                (pixels, cols, rows) = (pixels[visible], cols[visible],
+                                        rows[visible])
+            self.ram[cols, rows] = pixels
+
+            if self.partial or self.idle:
+                # In the low power modes the panel must be redrawn from the
+                # frame memory (rather than drawing the pixels directly)
+                self.redraw()
+                return
+
+            lines = self.display_row(rows)
+            visible = lines < HEIGHT
+            (x, y) = SKIN['adjust']
+            pixelview = pixels2d(windowsurface)
+            pixelview[x + cols[visible], y + lines[visible]] = pixels[visible]
+
             # Forcibly release the surface to ensure it is unlocked
             del pixelview
             if not self.mute:
-                window.refresh()
+                refresh()
 
 class CST816SSim():
     def __init__(self):
@@ -143,18 +316,16 @@ class CST816SSim():
               direction control).
         """
         if key.keysym.sym == sdl2.SDLK_DOWN:
-            self.regs[1] = 2
+            self.swipe('down', pins)
         elif key.keysym.sym == sdl2.SDLK_UP:
-            self.regs[1] = 1
+            self.swipe('up', pins)
         elif key.keysym.sym == sdl2.SDLK_LEFT:
-            self.regs[1] = 4
+            self.swipe('left', pins)
         elif key.keysym.sym == sdl2.SDLK_RIGHT:
-            self.regs[1] = 3
+            self.swipe('right', pins)
         elif key.keysym.sym == sdl2.SDLK_n:
             # Allow NEXT to be tested on the simulator
-            self.regs[1] = 253
-        self.regs[3] = 0x80
-        self.raise_interrupt(pins)
+            self.swipe('next', pins)
 
     def handle_mousebuttondown(self, button, pins):
         self.down_x = button.x
@@ -188,16 +359,18 @@ class CST816SSim():
         self.regs[6] = up_y;
         self.raise_interrupt(pins)
 
-    def press(self, x, y):
-        pins = wasp.watch.Pin.pins
+    def press(self, x, y, pins=None):
+        if not pins:
+            pins = wasp.watch.Pin.pins
         self.regs[1] = 5
         self.regs[4] = x
         self.regs[6] = y
         self.raise_interrupt(pins)
 
-    def swipe(self, direction):
-        pins = wasp.watch.Pin.pins
-        if direction ==' up':
+    def swipe(self, direction, pins=None):
+        if not pins:
+            pins = wasp.watch.Pin.pins
+        if direction == 'up':
             self.regs[1] = 1
         elif direction == 'down':
             self.regs[1] = 2
@@ -224,23 +397,80 @@ SKIN['window'] = (SKIN['size'][0] + SKIN['left_pad'] + SKIN['right_pad'],
 SKIN['adjust'] = (SKIN['offset'][0] + SKIN['left_pad'],
                   SKIN['offset'][1] + SKIN['top_pad'])
 
-sdl2.ext.init()
-window = sdl2.ext.Window("ST7789", size=SKIN['window'])
-window.show()
-windowsurface = window.get_surface()
-sdl2.ext.fill(windowsurface, (0xff, 0xff, 0xff))
-skin = sdl2.ext.load_image(SKIN['fname'])
-sdl2.SDL_BlitSurface(skin, None, windowsurface, sdl2.SDL_Rect(
-        SKIN['left_pad'], SKIN['top_pad'], SKIN['size'][0], SKIN['size'][1]))
-sdl2.SDL_FreeSurface(skin)
-window.refresh()
+if HEADLESS:
+    # The "window" is a numpy array with the same layout as pixels2d()
+    windowsurface = np.full(SKIN['window'], 0xffffff, dtype=np.uint32)
+    with Image.open(SKIN['fname']) as skin:
+        bg = Image.new('RGBA', skin.size, (0xff, 0xff, 0xff, 0xff))
+        rgb = np.asarray(Image.alpha_composite(bg, skin.convert('RGBA')),
+                         dtype=np.uint32)
+    rgb = (rgb[:, :, 0] << 16) + (rgb[:, :, 1] << 8) + rgb[:, :, 2]
+    windowsurface[SKIN['left_pad']:SKIN['left_pad']+SKIN['size'][0],
+                  SKIN['top_pad']:SKIN['top_pad']+SKIN['size'][1]] = rgb.T
+else:
+    sdl2.ext.init()
+    window = sdl2.ext.Window("ST7789", size=SKIN['window'])
+    window.show()
+    windowsurface = window.get_surface()
+    sdl2.ext.fill(windowsurface, (0xff, 0xff, 0xff))
+    skin = sdl2.ext.load_image(SKIN['fname'])
+    sdl2.SDL_BlitSurface(skin, None, windowsurface, sdl2.SDL_Rect(
+            SKIN['left_pad'], SKIN['top_pad'], SKIN['size'][0], SKIN['size'][1]))
+    sdl2.SDL_FreeSurface(skin)
+    window.refresh()
 
 spi_st7789_sim = ST7789Sim()
 i2c_cst816s_sim = CST816SSim()
 
+def pixels2d(surface):
+    """Get a writable array of pixels, indexed [x][y], for the window."""
+    if HEADLESS:
+        return surface
+    return sdl2.ext.pixels2d(surface)
+
+frame = { 'dirty': False, 'presented': 0.0, 'count': 0 }
+
+def refresh():
+    """Mark the window as needing an update after drawing into it."""
+    frame['dirty'] = True
+    if SHOW_WRITES:
+        present(True)
+
+def present(force=False):
+    """Update the window if anything has been drawn since the last update.
+
+    This is called once per tick but the update will be skipped if it is
+    too soon after the previous one (see ``WASP_SIM_FPS``).
+
+    :param bool force: Update the window regardless of the frame rate
+    """
+    if not frame['dirty']:
+        return
+    now = time.monotonic()
+    if FPS and not force and now - frame['presented'] < 1 / FPS:
+        return
+
+    frame['dirty'] = False
+    frame['presented'] = now
+    frame['count'] += 1
+    if not HEADLESS:
+        window.refresh()
+
+def framebuffer():
+    """Get a copy of the pixels shown on the panel.
+
+    :returns: numpy array of RGB565 pixels, indexed [y][x]
+    """
+    (x, y) = SKIN['adjust']
+    pixelview = pixels2d(windowsurface)
+    rgb = np.array(pixelview[x:x+WIDTH, y:y+HEIGHT], dtype=np.uint32).T
+    del pixelview
+    return (((rgb >> 8) & 0xf800) | ((rgb >> 5) & 0x07e0) |
+            ((rgb >> 3) & 0x001f)).astype(np.uint16)
+
 def save_image(surface, fname):
     """Save a surface as an image."""
-    raw = sdl2.ext.pixels2d(surface)
+    raw = pixels2d(surface)
 
     # Crop and swap the axes to ensure the final rotation is correct
     cropped = raw[SKIN['top_pad']:-SKIN['bottom_pad']]
@@ -258,7 +488,55 @@ def save_image(surface, fname):
     # Save the image
     Image.fromarray(rgb).save(fname)
 
+injected = []
+
+def inject(event, *args):
+    """Queue an input event to be handled by the next :py:func:`tick`.
+
+    This allows tests, scripts and the headless backend to provide input
+    without a window. The supported events are:
+
+    * ``inject('press', x, y)`` to touch the screen
+    * ``inject('swipe', direction)`` with a direction of ``'up'``,
+      ``'down'``, ``'left'``, ``'right'`` or ``'next'``
+    * ``inject('button', pressed)`` to press (or release) the button
+    * ``inject('key', name)`` to press one of the simulator's keys: the
+      arrow keys (``'up'``, ``'down'``...) and ``'n'`` provoke swipes (in
+      the same way as the windowed simulator) and ``'s'`` saves a
+      screenshot
+    """
+    injected.append((event,) + args)
+
+def _handle_injected(pins):
+    keys = { 'up': 'up', 'down': 'down', 'left': 'left', 'right': 'right',
+             'n': 'next' }
+
+    while injected:
+        event = injected.pop(0)
+        if event[0] == 'press':
+            i2c_cst816s_sim.press(event[1], event[2], pins)
+        elif event[0] == 'swipe':
+            i2c_cst816s_sim.swipe(event[1], pins)
+        elif event[0] == 'button':
+            pins['BUTTON'].value(0 if event[1] else 1)
+        elif event[0] == 'key' and event[1] == 's':
+            _screenshot()
+        elif event[0] == 'key':
+            i2c_cst816s_sim.swipe(keys[event[1]], pins)
+        else:
+            raise ValueError(event)
+
+def _screenshot():
+    fname = f'res/{wasp.system.app.NAME}App.png'.replace(' ', '')
+    save_image(windowsurface, fname)
+    print(f'Saved: {fname}')
+
 def tick(pins):
+    present()
+    _handle_injected(pins)
+    if HEADLESS:
+        return
+
     events = sdl2.ext.get_events()
     for event in events:
         if event.type == sdl2.SDL_QUIT:
@@ -270,9 +548,7 @@ def tick(pins):
             i2c_cst816s_sim.handle_mousebuttonup(event.button, pins)
         elif event.type == sdl2.SDL_KEYDOWN:
             if event.key.keysym.sym == sdl2.SDLK_s:
-                fname = f'res/{wasp.system.app.NAME}App.png'.replace(' ', '')
-                save_image(windowsurface, fname)
-                print(f'Saved: {fname}')
+                _screenshot()
             elif event.key.keysym.sym == sdl2.SDLK_TAB:
                 pins['BUTTON'].value(0)
             else:
@@ -0,0 +1,99 @@
+# SPDX-License-Identifier: LGPL-3.0-or-later
+# Copyright (C) 2020 Daniel Thompson
+
+"""Simulator instances.
+
+wasp-os is written for a device where every peripheral is a singleton so
+the simulated hardware (the display, touch screen, pins and clock) lives
+in module globals, exactly as it does on the watch. That means there can
+only be one simulated watch in each process. To simulate several watches
+at once, for example to run the tests in parallel using pytest-xdist, run
+one process for each watch and give each of them an :py:class:`Instance`.
+
+An instance owns the simulated hardware of its process together with a
+private working directory (the "sandbox") in which the apps can create
+files without trampling over the source tree or over each other.
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+
+# Top level of the source tree (the directory that contains README.rst)
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
+
+def _display():
+    # The display cannot be imported before wasp has been (wasp imports
+    # the simulated hardware, including the display, itself)
+    import wasp
+    import display
+    return display
+
+class Instance(object):
+    def __init__(self, name='sim'):
+        self.name = name
+        self.sandbox = None
+
+    @property
+    def display(self):
+        """The simulated ST7789 display."""
+        return _display().spi_st7789_sim
+
+    @property
+    def touch(self):
+        """The simulated CST816S touch screen."""
+        return _display().i2c_cst816s_sim
+
+    @property
+    def pins(self):
+        """The pin registry, keyed by pin name."""
+        import machine
+        return machine.Pin.pins
+
+    @property
+    def clock(self):
+        """The virtual clock (see vtime.py)."""
+        import vtime
+        return vtime.clock
+
+    def start(self):
+        """Create the sandbox and make it the current working directory.
+
+        Files created before the sandbox is started (for example by apps
+        constructed whilst the tests are being collected) are written to
+        the original directory. The search path is made absolute first so
+        that modules, and any subprocesses, can still be found after the
+        working directory has changed.
+        """
+        sys.path[:] = [ os.path.abspath(p) for p in sys.path ]
+        path = os.environ.get('PYTHONPATH')
+        if path:
+            os.environ['PYTHONPATH'] = os.pathsep.join(
+                    os.path.abspath(p) for p in path.split(os.pathsep))
+
+        self._cwd = os.getcwd()
+        self.sandbox = tempfile.mkdtemp(prefix=f'wasp-{self.name}-')
+        os.chdir(self.sandbox)
+
+    def stop(self):
+        """Return to the original directory and remove the sandbox."""
+        os.chdir(self._cwd)
+        shutil.rmtree(self.sandbox, ignore_errors=True)
+        self.sandbox = None
+
+    def reset(self):
+        """Discard any input, and clock changes, left behind by a test.
+
+        The state of wasp itself is not reset (there is no equivalent of
+        rebooting the watch) but pending input or a stopped clock would
+        otherwise leak into whatever runs next.
+        """
+        display = sys.modules.get('display')
+        if display:
+            display.injected.clear()
+            display.i2c_cst816s_sim.regs[1] = 0
+
+        vtime = sys.modules.get('vtime')
+        if vtime:
+            vtime.clock.set_speed(vtime.SPEED)
@@ -2,7 +2,7 @@
 # Copyright (C) 2020 Daniel Thompson
 
 import display
-import time
+import vtime
 
 class Tracer(object):
     def __init__(self, *args, **kwargs):
@@ -58,6 +58,8 @@ class Pin(object):
         else:
             if not self._quiet:
                 print(self._id + ": set off")
+            if self._id == 'DISP_CS':
+                display.spi_st7789_sim.select()
             self._value = True
 
     def __call__(self, v=None):
@@ -69,17 +71,19 @@ class PWM(Tracer):
 class SPI(object):
     def __init__(self, id):
         self._id = id
+        self.baudrate = 1000000
         if id == 0:
             self.sim = display.spi_st7789_sim
         else:
             self.sim = None
 
     def init(self, baudrate=1000000,  polarity=0, phase=0, bits=8, sck=None, mosi=None, miso=None):
-        pass
+        self.baudrate = baudrate
 
     def write(self, buf):
         if self.sim:
             self.sim.write(buf)
+            self.sim.transfer(len(buf), self.baudrate)
         else:
             print("Sending data: " + str(buf))
 
@@ -109,13 +113,17 @@ class Timer():
         self.period = period
 
     def start(self):
-        self.then = time.time()
+        self.then = vtime.time()
 
     def stop(self):
         self.then = None
 
     def time(self):
-        now = time.time()
+        # Apps busy wait on the timer so, if the virtual clock is stopped,
+        # reading the timer must move it along
+        if not vtime.clock.speed:
+            vtime.advance(0.001)
+        now = vtime.time()
         elapsed_sec = now - self.then
         elapsed_us = int(elapsed_sec * 1000000)
 
@@ -126,7 +134,7 @@ class Timer():
 
 def lightsleep(ms=10):
     display.tick(Pin.pins)
-    time.sleep(ms / 1000)
+    vtime.sleep(ms / 1000)
 
 def deepsleep(ms=10):
     lightsleep(ms)
@@ -48,4 +48,21 @@ wasp.system.blank_after = 300
 #        b'\x00\x0f'     # contrast
 #    )
 
+# Estimate how long app switches, ticks and drawing would take on the
+# real device (the report is printed when the simulator exits)
+import atexit
+import os
+if os.environ.get('WASP_SIM_TIMING'):
+    import timing
+    timing.install()
+    atexit.register(timing.report)
+
+# Record the session so it can be replayed later (see replay.py)
+if os.environ.get('WASP_SIM_RECORD'):
+    import replay
+    wasp.system.secondary_init()
+    recorder = replay.Recorder(os.environ['WASP_SIM_RECORD'])
+    recorder.start()
+    atexit.register(recorder.stop)
+
 wasp.system.run()
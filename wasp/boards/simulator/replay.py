@@ -0,0 +1,235 @@
+# SPDX-License-Identifier: LGPL-3.0-or-later
+# Copyright (C) 2020 Daniel Thompson
+
+"""Record and replay simulator sessions.
+
+A :py:class:`Recorder` captures everything that reaches the watch from
+the outside world: touch screen events (at the level of the CST816S
+registers so mouse drags, keys and injected events are all included),
+changes to the button and the values read from the simulated sensors.
+Each event is written as a line of text holding the time (in
+milliseconds of virtual time since the recording started), the source
+of the event and its value. Sensor values are only written when they
+change.
+
+A :py:class:`Replayer` stops the virtual clock and then feeds the events
+back to the watch at exactly the same (virtual) times, ticking the
+system manager in the same way as :py:meth:`wasp.Manager.run`. Replaying
+a recording is deterministic and, because the cost of every system tick
+is measured, it doubles as a benchmark.
+
+Set ``WASP_SIM_RECORD`` to a filename to record a session from the
+simulator and replay it using::
+
+    PYTHONPATH=.:wasp/boards/simulator:wasp \\
+        python3 wasp/boards/simulator/replay.py session.txt
+"""
+
+import wasp
+
+import ast
+import display
+import machine
+import timing
+import vtime
+
+# Sensor readings that are recorded (and replayed)
+SENSORS = (('hrs', ('read_hrs',)),
+           ('accel', ('steps', 'accel_xyz')),
+           ('battery', ('charging', 'level', 'voltage_mv')))
+
+class _Sensor(object):
+    """Stand in for a simulated sensor whilst recording or replaying."""
+    def __init__(self, name, sensor, attrs, session):
+        self.__dict__.update(_name=name, _sensor=sensor, _attrs=attrs,
+                             _session=session)
+
+    def __getattr__(self, attr):
+        sensor = self._sensor
+        if attr not in self._attrs:
+            return getattr(sensor, attr)
+
+        key = self._name + '.' + attr
+        read = self._session.read
+        if callable(getattr(type(sensor), attr)):
+            return lambda *args: read(key, getattr(sensor, attr), *args)
+        return read(key, lambda: getattr(sensor, attr))
+
+    def __setattr__(self, attr, value):
+        setattr(self._sensor, attr, value)
+
+class _Session(object):
+    def _install(self):
+        watch = wasp.watch
+        for (name, attrs) in SENSORS:
+            setattr(watch, name, _Sensor(name, getattr(watch, name), attrs,
+                                         self))
+
+    def _remove(self):
+        watch = wasp.watch
+        for (name, attrs) in SENSORS:
+            setattr(watch, name, getattr(watch, name)._sensor)
+
+class Recorder(_Session):
+    def __init__(self, fname):
+        self.fname = fname
+        self._f = None
+
+    def start(self):
+        """Start recording."""
+        self._f = open(self.fname, 'w')
+        self._f.write('# wasp-os simulator recording\n')
+        self._start = vtime.time()
+        self._last = {}
+        self._log('app', wasp.system.app.NAME)
+
+        touch = display.i2c_cst816s_sim
+        raise_interrupt = touch.raise_interrupt
+        def recorded_interrupt(pins):
+            regs = touch.regs
+            self._log('touch', (regs[1], regs[3], regs[4], regs[6]))
+            raise_interrupt(pins)
+        touch.raise_interrupt = recorded_interrupt
+
+        button = machine.Pin.pins['BUTTON']
+        value = button.value
+        def recorded_value(v=None):
+            if v is not None:
+                self._log('button', int(bool(v)))
+            return value(v)
+        button.value = recorded_value
+
+        self._install()
+
+    def stop(self):
+        """Stop recording and close the file."""
+        if not self._f:
+            return
+        self._log('end', None)
+        self._remove()
+        del display.i2c_cst816s_sim.raise_interrupt
+        del machine.Pin.pins['BUTTON'].value
+        self._f.close()
+        self._f = None
+
+    def read(self, key, fn, *args):
+        value = fn(*args)
+        if self._last.get(key, None) != value:
+            self._last[key] = value
+            self._log(key, value)
+        return value
+
+    def _log(self, key, value):
+        ms = int((vtime.time() - self._start) * 1000)
+        self._f.write('{} {} {!r}\n'.format(ms, key, value))
+        self._f.flush()
+
+def load(fname):
+    """Load a recording.
+
+    :returns: List of ``(ms, key, value)`` tuples
+    """
+    events = []
+    with open(fname) as f:
+        for ln in f:
+            if ln.startswith('#') or not ln.strip():
+                continue
+            (ms, key, value) = ln.split(' ', 2)
+            events.append((int(ms), key, ast.literal_eval(value)))
+    return events
+
+class Replayer(_Session):
+    def __init__(self, fname):
+        self.events = load(fname)
+        self.steps = []
+        self._held = {}
+
+    def run(self):
+        """Replay the recording.
+
+        Every system tick that updates the display is recorded in
+        ``steps`` as a tuple of the time (in milliseconds since the start
+        of the recording), the name of the active app, the estimated time
+        the device would spend driving the display (in microseconds) and
+        the number of bytes and transfers sent to the display.
+
+        :returns: The list of steps
+        """
+        system = wasp.system
+        spi = wasp.watch.display
+        instrumented = spi.spi_stats is not None
+        if not instrumented:
+            spi.instrument()
+        speed = vtime.clock.speed
+        vtime.set_speed(0)
+        self._held = {}
+        self._install()
+
+        start = vtime.time()
+        events = self.events
+        i = 0
+        try:
+            while i < len(events):
+                ms = int(round((vtime.time() - start) * 1000))
+                while i < len(events) and events[i][0] <= ms:
+                    self._apply(events[i][1], events[i][2])
+                    i += 1
+
+                stats = list(spi.spi_stats)
+                us = timing.busy_us()
+                system._tick()
+                us = timing.busy_us() - us
+                nbytes = spi.spi_stats[0] - stats[0]
+                if nbytes:
+                    self.steps.append((ms, timing._app_name(system.app), us,
+                                       nbytes, spi.spi_stats[1] - stats[1]))
+
+                machine.deepsleep()
+        finally:
+            self._remove()
+            vtime.set_speed(speed)
+            if not instrumented:
+                spi.instrument(False)
+
+        return self.steps
+
+    def read(self, key, fn, *args):
+        if key in self._held:
+            return self._held[key]
+        return fn(*args)
+
+    def _apply(self, key, value):
+        if key == 'app':
+            for app in wasp.system.quick_ring + wasp.system.launcher_ring:
+                if app.NAME == value:
+                    wasp.system.switch(app)
+        elif key == 'touch':
+            touch = display.i2c_cst816s_sim
+            (touch.regs[1], touch.regs[3], touch.regs[4], touch.regs[6]) = value
+            touch.raise_interrupt(machine.Pin.pins)
+        elif key == 'button':
+            machine.Pin.pins['BUTTON'].value(value)
+        elif key != 'end':
+            self._held[key] = value
+
+    def report(self):
+        """Print the cost of every step followed by a summary."""
+        fmt = '{:>8} {:20} {:>10} {:>8} {:>6}'
+        print(fmt.format('Time', 'App', 'Cost (ms)', 'Bytes', 'Xfers'))
+        for (ms, name, us, nbytes, xfers) in self.steps:
+            print(fmt.format(ms, name, '{:.1f}'.format(us / 1000), nbytes,
+                             xfers))
+
+        if self.steps:
+            total = sum(s[2] for s in self.steps)
+            worst = max(s[2] for s in self.steps)
+            print('{} steps, {:.1f} ms in total, worst step {:.1f} ms'.format(
+                  len(self.steps), total / 1000, worst / 1000))
+
+if __name__ == '__main__':
+    import sys
+
+    wasp.system.secondary_init()
+    replayer = Replayer(sys.argv[1])
+    replayer.run()
+    replayer.report()
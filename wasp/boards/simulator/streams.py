@@ -0,0 +1,106 @@
+# SPDX-License-Identifier: LGPL-3.0-or-later
+# Copyright (C) 2020 Daniel Thompson
+
+"""Recorded sensor data for the simulator.
+
+By default the simulated sensors make up their readings. They can instead
+stream readings from recorded files by setting the following environment
+variables to the name of a file:
+
+* ``WASP_SIM_HRS``: raw heart rate sensor samples, at 24Hz, in the format
+  written to ``hrs.data`` by :py:class:`ppg.PPG` when debugging is enabled
+* ``WASP_SIM_ACCEL``: accelerometer records (see ``ACCEL``)
+* ``WASP_SIM_BATTERY``: battery records (see ``BATTERY``)
+
+The accelerometer and battery records are raw little endian structures
+that can be written using ``numpy.ndarray.tofile()``.
+
+The files are memory mapped, so even very long recordings cost almost
+nothing to load, and are sampled according to the virtual clock (see
+vtime.py). When a stream reaches the end of the recording it starts again
+from the beginning.
+"""
+
+import numpy as np
+import os
+import vtime
+
+# Accelerometer records: raw x, y and z readings together with the total
+# number of steps counted so far, sampled at ACCEL_RATE
+ACCEL = np.dtype([('xyz', '<i2', (3,)), ('steps', '<u4')])
+ACCEL_RATE = 25
+
+# Battery records: voltage in millivolts and whether the watch is on its
+# charger (0 or 1), sampled at BATTERY_RATE
+BATTERY = np.dtype([('mv', '<u2'), ('charging', '<u2')])
+BATTERY_RATE = 1
+
+# hrs.data is a series of blocks of 24Hz samples. Every block starts with
+# a re-sync marker followed by the time (as six 16-bit words).
+_HRS_MARKER = 0xffff
+_HRS_HEADER = 7
+HRS_RATE = 24
+
+class Stream(object):
+    """Sample a recording made from fixed size records at a fixed rate."""
+    def __init__(self, fname, dtype, rate):
+        self.data = np.memmap(fname, dtype=dtype, mode='r')
+        self.rate = rate
+        self._start = vtime.time()
+
+    def _count(self):
+        """Get the number of samples that should have been taken so far."""
+        return int((vtime.time() - self._start) * self.rate)
+
+    def position(self):
+        """Get the number of times the recording has looped and the index
+        of the current record.
+        """
+        return divmod(self._count(), len(self.data))
+
+    def sample(self):
+        """Get the current record."""
+        return self.data[self.position()[1]]
+
+class HRSStream(Stream):
+    """Stream raw heart rate sensor samples from hrs.data.
+
+    The re-sync markers and timestamps mean samples cannot be found just
+    by indexing so, instead, the stream keeps a cursor that follows the
+    virtual clock. Normally the clock moves forwards by a few samples
+    between reads, making each read very cheap.
+    """
+    def __init__(self, fname):
+        super().__init__(fname, '<u2', HRS_RATE)
+        self._count_at = 0
+        self._cursor = self._skip(0)
+
+    def _skip(self, i):
+        """Find the first sample at, or after, word i (looping if needed)."""
+        data = self.data
+        for loop in range(2):
+            while i < len(data) and data[i] == _HRS_MARKER:
+                i += _HRS_HEADER
+            if i < len(data):
+                return i
+            i = 0
+        raise ValueError('No samples in recording')
+
+    def sample(self):
+        """Get the current sample."""
+        count = self._count()
+        if count < self._count_at:
+            # The clock has moved backwards so start again
+            self._count_at = 0
+            self._cursor = self._skip(0)
+
+        while self._count_at < count:
+            self._cursor = self._skip(self._cursor + 1)
+            self._count_at += 1
+
+        return int(self.data[self._cursor])
+
+def from_env(name, constructor, *args):
+    """Open the stream named by an environment variable (if it is set)."""
+    fname = os.environ.get(name)
+    return constructor(fname, *args) if fname else None
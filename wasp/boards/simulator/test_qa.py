@@ -1,6 +1,7 @@
 import pytest
 import wasp
 import importlib
+import instance
 import os
 from PIL import Image
 
@@ -20,7 +21,7 @@ def test_screenshot(constructor):
     #
     # Press 's' in the simulator to capture a screenshot that meets these
     # requirements.
-    with Image.open(fname) as screenshot:
+    with Image.open(os.path.join(instance.ROOT, fname)) as screenshot:
         assert screenshot.width == 358
         assert screenshot.height == 406
 
@@ -29,7 +30,7 @@ def test_README(constructor):
         return
     fname = f'res/{constructor.NAME}App.png'.replace(' ', '')
 
-    with open('README.rst') as f:
+    with open(os.path.join(instance.ROOT, 'README.rst')) as f:
         readme = f.readlines()
 
     # Get the offset (or offsets) of that fname within the file
@@ -59,9 +60,9 @@ def test_app_library(constructor):
     if constructor.NAME in EXCLUDE:
         return
 
-    with open('docs/apps.rst') as f:
+    with open(os.path.join(instance.ROOT, 'docs/apps.rst')) as f:
         appdoc = f.read()
-    with open('docs/wasp.rst') as f:
+    with open(os.path.join(instance.ROOT, 'docs/wasp.rst')) as f:
         waspdoc = f.read()
 
     # Every application must be listed in the Application Library
@@ -1,13 +1,15 @@
 import pytest
 import time
+import vtime
 import wasp
+import apps.pager
 import apps.testapp
 import apps.settings
 
 def step():
     wasp.system._tick()
     wasp.machine.deepsleep()
-    time.sleep(0.1)
+    vtime.sleep(0.1)
 wasp.system.step = step
 
 wasp.watch.touch.press = wasp.watch.touch.i2c.sim.press
@@ -50,6 +52,344 @@ def test_app(system, name):
         system.step()
     system.switch(system.quick_ring[0])
 
+def test_window_cache(system):
+    display = wasp.watch.display
+    draw = wasp.watch.drawable
+    before = list(display.window_stats)
+
+    # Adjacent columns share the same rows
+    for x in range(100, 110):
+        draw.fill(0xffff, x, 60, 1, 120)
+    stats = [ a - b for (a, b) in zip(display.window_stats, before) ]
+    assert stats[0] == 10 and stats[1] == 10 and stats[2] <= 1
+
+    # Every window is sent after a reset
+    display.invalidate_window()
+    draw.fill(0, 100, 60, 10, 120)
+    assert display.window_stats[1] == before[1] + 11
+    assert display.window_stats[2] == before[2] + stats[2] + 1
+
+def pixel(x, y):
+    import display as sim
+
+    pixelview = sim.pixels2d(sim.windowsurface)
+    px = pixelview[x + sim.SKIN['adjust'][0]][y + sim.SKIN['adjust'][1]]
+    del pixelview
+    return px
+
+def test_frame_pacing(system):
+    import display as sim
+
+    sim.present()
+    count = sim.frame['count']
+    wasp.watch.drawable.string('Hello, world', 0, 100, width=240)
+    assert sim.frame['dirty']
+    assert sim.frame['count'] == count
+
+    wasp.machine.deepsleep()
+    assert not sim.frame['dirty']
+    assert sim.frame['count'] == count + 1
+
+def test_ramwr(system):
+    display = wasp.watch.display
+
+    # Pixels can be split between writes and wrap at the edges of the window
+    display.set_window(10, 10, 3, 2)
+    display.write_data(b'\xf8\x00\xf8')
+    display.write_data(b'\x00' + b'\x07\xe0' * 4 + b'\x00\x1f' * 2)
+    assert [ pixel(x, 10) for x in range(10, 13) ] == \
+            [ 0x0000f8, 0x0000f8, 0x00fc00 ]
+    assert [ pixel(x, 11) for x in range(10, 13) ] == [ 0x00fc00 ] * 3
+
+def test_headless():
+    import os
+    import subprocess
+    import sys
+
+    script = """
+import wasp
+import display
+import numpy as np
+
+assert display.HEADLESS
+wasp.system.secondary_init()
+clock = wasp.system.app
+fb = display.framebuffer()
+assert fb.shape == (240, 240) and fb.any()
+
+display.inject('swipe', 'left')
+wasp.machine.deepsleep()
+wasp.system._tick()
+assert wasp.system.app is not clock
+assert not np.array_equal(fb, display.framebuffer())
+"""
+    env = dict(os.environ, WASP_SIM_HEADLESS='1')
+    subprocess.run([sys.executable, '-c', script], env=env, check=True,
+                   stdout=subprocess.DEVNULL)
+
+def test_sandbox(system, simulator):
+    import instance
+    import os
+
+    # Files created by the apps are kept out of the source tree
+    assert os.getcwd() == simulator.sandbox
+    assert not simulator.sandbox.startswith(instance.ROOT)
+    assert simulator.pins['BUTTON'] is wasp.watch.button
+
+def test_scroll(system):
+    display = wasp.watch.display
+    draw = wasp.watch.drawable
+    draw.fill(0xf800, 0, 0, 240, 24)
+    draw.fill(0x001f, 0, 24, 240, 216)
+
+    # Scroll up by one 24 line strip (the red strip wraps to the bottom)
+    display.set_scroll_area()
+    display.scroll(24)
+    assert pixel(120, 0) == 0x0000f8
+    assert pixel(120, 239) == 0xf80000
+    assert display.frame_row(216) == 0
+
+    # Redraw the exposed strip
+    draw.fill(0x07e0, 0, display.frame_row(216), 240, 24)
+    assert pixel(120, 239) == 0x00fc00
+
+    display.scroll(0)
+    assert pixel(120, 0) == 0x00fc00
+    assert display.frame_row(216) == 216
+
+def test_always_on(system):
+    import display as sim
+    panel = sim.spi_st7789_sim
+    display = wasp.watch.display
+
+    # Redraw the clock (an earlier test may have left a mess)
+    system.app.foreground()
+    system.always_on = True
+    system.sleep()
+    assert panel.partial and panel.idle
+    assert not any(pixel(x, 190) for x in range(240))
+    digits = set(pixel(x, 110) for x in range(240))
+    assert 0xffffff in digits
+    assert digits <= { 0, 0xffffff }
+
+    # Wait for the (forced) change of minute
+    before = display.window_stats[0]
+    system._minute = 0
+    for i in range(20):
+        system.step()
+        if display.window_stats[0] != before:
+            break
+    assert display.window_stats[0] != before
+    assert panel.partial and panel.idle
+
+    system.wake()
+    system.always_on = False
+    assert not panel.partial and not panel.idle
+    assert any(pixel(x, 190) for x in range(240))
+
+def test_always_on_fallback(system, monkeypatch):
+    import display as sim
+    panel = sim.spi_st7789_sim
+
+    class Refuser():
+        NAME = 'Refuser'
+
+        def foreground(self):
+            pass
+
+        def sleep(self):
+            system.request_always_on(0, 240)
+            return False
+
+    # A request made by an app that then refuses to sleep must not
+    # survive the switch to the default app
+    clock = system.quick_ring[0]
+    monkeypatch.setattr(clock, 'sleep', lambda: True)
+    system.always_on = True
+    system.switch(Refuser())
+    system.sleep()
+    assert system.app == clock
+    assert not panel.partial and not panel.idle
+
+    system.wake()
+    system.always_on = False
+
+def test_statusbar(system, monkeypatch):
+    bar = system.bar
+    draw = wasp.watch.drawable
+
+    def redraw():
+        draw.fill(0, 0, 0, 240, 32)
+        bar.draw()
+        return [ pixel(x, y) for y in range(32) for x in range(240) ]
+
+    # Drawing the status bar directly gives the same result as composing
+    # it off-screen
+    vtime.set_speed(0)
+    composed = redraw()
+    assert any(composed)
+    assert bar._canvas
+    monkeypatch.delattr(wasp.watch, 'statusbar_canvas')
+    monkeypatch.setattr(bar, '_canvas', None)
+    assert redraw() == composed
+    assert not bar._canvas
+
+def test_time_warp(system):
+    steps = system.apps['Steps']
+    accel = wasp.watch.accel
+    alarms = system._alarms
+
+    # Stop the clock a few seconds before midnight and let the step
+    # counter arm its alarm (other alarms, such as the step logger, are
+    # set aside so they cannot delay the reset)
+    system.switch(steps)
+    system._alarms = []
+    vtime.set_speed(0)
+    tomorrow = time.localtime(time.time() + 24 * 60 * 60)
+    vtime.set_time(time.mktime(tomorrow[:3] + (23, 59, 50, 0, 0, -1)))
+    system.switch(system.quick_ring[0])
+    wake = steps._wake
+    accel._steps = 20000
+
+    try:
+        vtime.sleep(5)
+        assert wasp.watch.rtc.get_time() == (23, 59, 55)
+        assert accel._steps == 20000
+
+        vtime.warp(10)
+        assert wasp.watch.rtc.get_time() == (0, 0, 5)
+        assert accel._steps == 3
+        assert system._alarms == [ (wake + 24 * 60 * 60, steps._reset) ]
+    finally:
+        system._alarms = alarms
+        vtime.set_speed(1)
+        vtime.set_time(time.time())
+        system.switch(steps)
+        system.switch(system.quick_ring[0])
+        system.wake()
+
+def test_replay(system):
+    import replay
+
+    # Record a swipe to the next app
+    recorder = replay.Recorder('session.txt')
+    recorder.start()
+    system.step()
+    wasp.watch.touch.swipe('left')
+    for i in range(3):
+        system.step()
+    recorder.stop()
+    app = system.app
+    assert app != system.quick_ring[0]
+
+    # Replaying the session repeats the swipe and measures every redraw
+    system.switch(system.quick_ring[0])
+    replayer = replay.Replayer('session.txt')
+    steps = replayer.run()
+    assert system.app == app
+    assert steps and all(s[3] > 0 for s in steps)
+    assert app.NAME in [ s[1] for s in steps ]
+    assert not isinstance(wasp.watch.hrs, replay._Sensor)
+    replayer.report()
+
+def test_sensor_streams(system):
+    import array
+    import numpy as np
+    import streams
+
+    vtime.set_speed(0)
+
+    # Two blocks of heart rate samples (the second is read after the
+    # header is skipped) and then back to the start of the recording
+    header = array.array('H', (0xffff, 2020, 1, 1, 0, 0, 0))
+    with open('hrs.data', 'wb') as f:
+        f.write(header + array.array('H', range(1000, 1100)))
+        f.write(header + array.array('H', range(2000, 2050)))
+    hrs = streams.HRSStream('hrs.data')
+    assert hrs.sample() == 1000
+    vtime.advance(10.5 / streams.HRS_RATE)
+    assert hrs.sample() == 1010
+    vtime.advance(100 / streams.HRS_RATE)
+    assert hrs.sample() == 2010
+    vtime.advance(40 / streams.HRS_RATE)
+    assert hrs.sample() == 1000
+
+    accel = np.zeros(5, dtype=streams.ACCEL)
+    accel['xyz'] = [ (i, -i, 1000) for i in range(5) ]
+    accel['steps'] = [ 0, 1, 1, 2, 3 ]
+    accel.tofile('accel.data')
+    battery = np.array([ (3700, 0), (4100, 1) ], dtype=streams.BATTERY)
+    battery.tofile('battery.data')
+
+    watch = wasp.watch
+    watch.hrs._stream = hrs
+    watch.accel._stream = streams.Stream('accel.data', streams.ACCEL, 1)
+    watch.battery._stream = streams.Stream('battery.data', streams.BATTERY, 1)
+    try:
+        watch.accel.reset()
+        assert watch.hrs.read_hrs() == 1000
+        assert watch.accel.accel_xyz() == (0, 0, 1000)
+        assert watch.battery.voltage_mv() == 3700
+        assert not watch.battery.charging()
+
+        # The step count keeps going up when the recording loops
+        vtime.advance(7.5)
+        assert watch.accel.accel_xyz() == (2, -2, 1000)
+        assert watch.accel.steps == 4
+        assert watch.battery.charging()
+        assert watch.battery.level() == 100
+    finally:
+        watch.hrs._stream = None
+        watch.accel._stream = None
+        watch.battery._stream = None
+        watch.accel.reset()
+
+def test_instrument(system):
+    display = wasp.watch.display
+
+    system.instrument()
+    display.fill(0, 10, 10, 10, 2)
+    assert display.spi_stats[0] >= 40
+    assert display.spi_stats[3] >= 1
+
+    system.switch(system.apps['Steps'])
+    system.step()
+    system.switch(system.quick_ring[0])
+
+    stats = system.spi_stats
+    assert 'Clock' in stats and 'Steps' in stats
+    (frames, nbytes, xfers, cs, cmds, wins, peak) = stats['Steps']
+    assert frames >= 1
+    assert nbytes >= peak > 0
+    assert xfers > 0 and cs > 0 and cmds > 0 and wins > 0
+    system.spi_report()
+
+    system.instrument(False)
+    assert display.spi_stats is None
+    assert system.spi_stats is None
+
+def test_pager(system):
+    msg = 'The quick brown fox jumps over the lazy dog. ' * 40
+    lines = len(wasp.watch.drawable.wrap(msg, 240)) - 1
+    pager = apps.pager.PagerApp(msg)
+    system.switch(pager)
+
+    # Page down until the pager exits...
+    pages = 1
+    while system.app == pager:
+        pager.swipe((wasp.EventType.UP, 120, 120))
+        pages += 1
+    assert pages == 2 + (lines - 1) // 9
+
+    # ... and then back up again
+    system.switch(pager)
+    for i in range(pages - 2):
+        pager.swipe((wasp.EventType.UP, 120, 120))
+    assert pager._page == pages - 2
+    for i in range(pages - 2):
+        pager.swipe((wasp.EventType.DOWN, 120, 120))
+    assert pager._page == 0
+
 def test_constructor(system, constructor):
     # Special case for the notification app
     if 'NotificationApp' in str(constructor):
@@ -74,6 +414,28 @@ def test_constructor(system, constructor):
         if 'HaikuApp' not in str(constructor):
             raise
 
+# Estimated time (in microseconds) an app may spend drawing when it is
+# started on the real device
+REDRAW_BUDGET_US = 300000
+
+def test_redraw_budget(system, constructor):
+    import timing
+
+    if 'NotificationApp' in str(constructor):
+        return
+
+    try:
+        app = constructor()
+        (_, us) = timing.measure(system.switch, app)
+        system.switch(system.quick_ring[0])
+    except FileNotFoundError:
+        if 'HaikuApp' not in str(constructor):
+            raise
+        return
+
+    assert us < REDRAW_BUDGET_US, \
+            f'{app.NAME}: redraw estimated at {us // 1000}ms on the device'
+
 def test_stopwatch(system):
     system.switch(system.apps['Stopclock'])
 
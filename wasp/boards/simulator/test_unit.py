@@ -58,6 +58,19 @@ def test_font_width(draw):
         if f.max_ch() >= 90:
             assert draw.bounding_box('IIII')[0] < draw.bounding_box('WWWW')[0]
 
+def test_measure(draw):
+    for f in (fonts.sans18, fonts.sans24, fonts.sans28, fonts.sans36):
+        draw.set_font(f)
+        for s in ('0123', '12:34', 'Hello, World!', '\u00e9t\u00e9', ''):
+            w = 0
+            for ch in s:
+                w += f.get_ch(ch)[2] + 1
+            assert draw.measure(s) == w
+            assert fonts.width(f, s) == w
+            assert draw.fit(s, w) == len(s)
+            if s:
+                assert draw.fit(s, w - 1) == len(s) - 1
+
 @pytest.mark.parametrize("input,expected", (
     ('abc', [0, 3]),
     ('one.two', [0, 7]),
@@ -70,3 +83,279 @@ def test_font_width(draw):
 ))
 def test_wrap(draw, input, expected):
     assert draw.wrap(input, 240) == expected
+
+def test_composite():
+    fill = lambda c, x, y, w, h: (x, y, w, h, draw565._FILL, c, 0, None)
+    blit = lambda x, y, w, h: (x, y, w, h, draw565._BLIT, None, 0, None)
+
+    # Fills that are completely hidden are dropped
+    assert draw565._composite([ fill(0, 10, 10, 20, 20),
+                                fill(1, 0, 0, 240, 240) ]) == \
+            [ fill(1, 0, 0, 240, 240) ]
+
+    # Fills are trimmed to the visible fragments
+    assert draw565._composite([ fill(0, 0, 0, 240, 240),
+                                blit(0, 100, 240, 40) ]) == \
+            [ fill(0, 0, 0, 240, 100), fill(0, 0, 140, 240, 100),
+              blit(0, 100, 240, 40) ]
+
+    # Adjacent fills of the same colour are merged
+    assert draw565._composite([ fill(0, 0, 0, 240, 10),
+                                fill(0, 0, 10, 240, 10),
+                                fill(0, 240, 0, 10, 20) ]) == \
+            [ fill(0, 0, 0, 250, 20) ]
+    assert draw565._composite([ fill(0, 0, 0, 240, 10),
+                                fill(1, 0, 10, 240, 10) ]) == \
+            [ fill(0, 0, 0, 240, 10), fill(1, 0, 10, 240, 10) ]
+
+def test_glyph_cache():
+    cache = draw565.GlyphCache(2048)
+
+    (px, w, h) = cache.get(fonts.sans24, '0', 0xffff)
+    assert len(px) == 2 * w * h
+    assert (cache.hits, cache.misses) == (0, 1)
+    assert cache.get(fonts.sans24, '0', 0xffff)[0] is px
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    # Changing the colour is a different glyph
+    assert cache.get(fonts.sans24, '0', 0xf800)[0] is not px
+    assert (cache.hits, cache.misses) == (1, 2)
+
+    # The budget is never exceeded and the least recently used glyph
+    # is evicted first
+    for ch in '0123456789':
+        cache.get(fonts.sans24, ch, 0xffff)
+        assert cache.used <= cache.budget
+    assert cache.hits == 2
+    cache.get(fonts.sans24, '9', 0xffff)
+    assert cache.hits == 3
+    cache.get(fonts.sans24, '0', 0xf800)
+    assert cache.hits == 3
+
+    # Glyphs larger than the budget are drawn but not cached
+    cache = draw565.GlyphCache(16)
+    assert cache.get(fonts.sans24, '0', 0xffff)
+    assert cache.used == 0
+
+class Framebuffer():
+    """Minimal display driver that records the pixels drawn."""
+    def __init__(self):
+        self.width = 240
+        self.height = 240
+        self.linebuffer = memoryview(bytearray(2 * self.width))
+        self.pixels = {}
+        self.windows = 0
+
+    def set_window(self, x, y, w, h):
+        self._window = (x, y, w, h)
+        self._pos = 0
+        self.windows += 1
+
+    def write_data(self, buf):
+        (x, y, w, h) = self._window
+        for i in range(0, len(buf), 2):
+            p = self._pos
+            assert (x + p % w, y + p // w) not in self.pixels
+            self.pixels[(x + p % w, y + p // w)] = (buf[i] << 8) + buf[i+1]
+            self._pos += 1
+
+    quick_write = write_data
+
+    def quick_start(self):
+        pass
+
+    def quick_end(self):
+        pass
+
+    def rawblit(self, buf, x, y, w, h):
+        self.set_window(x, y, w, h)
+        self.write_data(buf)
+
+@pytest.mark.parametrize("line,width", (
+    ((10, 10, 100, 40), 1),
+    ((10, 10, 100, 40), 4),
+    ((100, 10, 10, 200), 3),
+    ((10, 200, 40, 10), 5),
+))
+def test_line(line, width):
+    fb = Framebuffer()
+    draw565.Draw565(fb).line(*line, width, 0xf800)
+
+    # Every point on the line is drawn exactly once (Framebuffer checks
+    # for overdraw) using one window for each row or column
+    (x0, y0, x1, y1) = line
+    assert (x0, y0) in fb.pixels and (x1, y1) in fb.pixels
+    assert fb.windows == min(abs(x1 - x0), abs(y1 - y0)) + width
+    assert len(fb.pixels) >= width * max(abs(x1 - x0), abs(y1 - y0))
+    assert set(fb.pixels.values()) == { 0xf800 }
+
+def test_shapes():
+    fb = Framebuffer()
+    draw = draw565.Draw565(fb)
+
+    # A filled circle is symmetric, identical rows share a window and it
+    # covers (roughly) pi * (r + 1/2) ** 2 pixels
+    draw.circle(120, 120, 40, 0, 0x07e0)
+    disc = set(fb.pixels)
+    assert fb.windows == 47
+    assert abs(len(disc) - 3.1416 * 40.5 * 40.5) < 40
+    assert all((240 - x, 240 - y) in disc for (x, y) in disc)
+
+    # A ring is a disc with a hole in the middle
+    fb.pixels = {}
+    draw.circle(120, 120, 40, 4, 0x07e0)
+    ring = set(fb.pixels)
+    assert ring < disc
+    assert (120, 120) not in ring and (120, 80) in ring and (80, 120) in ring
+
+    # Arcs are drawn clockwise from the top
+    fb.pixels = {}
+    draw.arc(120, 120, 40, 0, 90, 4, 0x07e0)
+    assert set(fb.pixels) == set((x, y) for (x, y) in ring
+                                 if x >= 120 and y <= 120)
+    fb.pixels = {}
+    draw.arc(120, 120, 40, 90, 360, 4, 0x07e0)
+    assert set(fb.pixels) == set((x, y) for (x, y) in ring
+                                 if x <= 120 or y >= 120)
+
+    # The straight part of a rounded rectangle is drawn using a single
+    # window (as are identical rows in the corners) and the outline is
+    # exactly the filled shape minus its inside
+    fb.pixels = {}
+    fb.windows = 0
+    draw.rounded_rect(20, 20, 100, 50, 10, 0, 0x001f)
+    filled = set(fb.pixels)
+    assert fb.windows == 15
+    assert (20, 45) in filled and (119, 45) in filled
+    assert (20, 20) not in filled and (30, 20) in filled
+    fb.pixels = {}
+    draw.rounded_rect(20, 20, 100, 50, 10, 3, 0x001f)
+    assert set(fb.pixels) < filled
+    assert (70, 45) not in fb.pixels and (22, 45) in fb.pixels
+
+    fb.pixels = {}
+    draw.polygon(((120, 20), (220, 200), (20, 200)), 0, 0xffe0)
+    assert (120, 20) in fb.pixels and (20, 200) in fb.pixels
+    assert (120, 100) in fb.pixels and (40, 100) not in fb.pixels
+    assert set(fb.pixels.values()) == { 0xffe0 }
+
+    # The rows between two vertical edges are drawn using a single window
+    fb.pixels = {}
+    fb.windows = 0
+    draw.polygon(((20, 20), (60, 20), (60, 40), (20, 40)), 0, 0xffe0)
+    assert fb.windows == 1
+    assert len(fb.pixels) == 41 * 21
+
+def test_batch_shapes():
+    fb = Framebuffer()
+    draw = draw565.Draw565(fb)
+
+    # Shapes do not hide what is underneath them but they can be hidden
+    draw.begin()
+    draw.circle(60, 60, 20, 4, 0x07e0)
+    draw.polygon(((150, 10), (200, 60), (150, 60)), 0, 0xffe0)
+    draw.fill(0, 140, 0, 100, 100)
+    assert draw.commit() == (40, 0, 200, 100)
+    assert fb.pixels[(60, 40)] == 0x07e0
+    assert set(fb.pixels.values()) == { 0, 0x07e0 }
+
+def test_canvas():
+    fb = Framebuffer()
+    canvas = draw565.Canvas(fb, 10, 20, 40, 10)
+
+    # Drawing uses display coordinates and is clipped to the canvas
+    canvas.fill(0x001f)
+    canvas.fill(0xf800, 0, 0, 30, 25)
+    canvas.line(0, 29, 100, 29, 1, 0x07e0)
+    assert fb.windows == 0
+
+    canvas.flush()
+    assert fb.windows == 1
+    assert len(fb.pixels) == 40 * 10
+    assert fb.pixels[(10, 20)] == 0xf800 and fb.pixels[(29, 24)] == 0xf800
+    assert fb.pixels[(30, 24)] == 0x001f and fb.pixels[(10, 25)] == 0x001f
+    assert fb.pixels[(49, 29)] == 0x07e0
+
+    # Moving the canvas keeps its contents
+    fb.pixels = {}
+    canvas.move(100, 100)
+    canvas.flush()
+    assert fb.pixels[(100, 100)] == 0xf800 and fb.pixels[(139, 109)] == 0x07e0
+
+def test_canvas_batch():
+    fb = Framebuffer()
+    draw = draw565.Draw565(fb)
+    canvas = draw565.Canvas(fb, 10, 20, 40, 10, draw)
+    canvas.fill(0x001f)
+
+    # A canvas flushed whilst its parent has a batch open is drawn, in
+    # order, when the batch is committed
+    draw.begin()
+    draw.fill(0xf800)
+    canvas.flush()
+    assert fb.windows == 0
+    draw.commit()
+    assert fb.pixels[(10, 20)] == 0x001f and fb.pixels[(49, 29)] == 0x001f
+    assert fb.pixels[(9, 20)] == 0xf800 and fb.pixels[(50, 29)] == 0xf800
+
+def test_blit_indexed():
+    fb = Framebuffer()
+    draw = draw565.Draw565(fb)
+
+    # 4x2, 4-bit: three white pixels then five black ones
+    draw.blit(b'\x04\x04\x02\x02\x00\xd7\x13\x05', 10, 10)
+    assert len(fb.pixels) == 8
+    assert [ fb.pixels[(x, 10)] for x in range(10, 14) ] == \
+           [ 0xffff, 0xffff, 0xffff, 0 ]
+    assert set(fb.pixels[(x, 11)] for x in range(10, 14)) == { 0 }
+
+    # 20x20, 8-bit: a single run of 400 red pixels (the run is longer than
+    # the line buffer and needs a continuation byte)
+    fb.pixels = {}
+    draw.blit(b'\x08\x14\x14\x01\xb4\x00\xff\x91', 100, 100)
+    assert len(fb.pixels) == 400
+    assert set(fb.pixels.values()) == { 0xf800 }
+
+def test_st7789_fill():
+    import wasp
+    from drivers.st7789 import ST7789
+
+    class Recorder(ST7789):
+        def reset(self):
+            self.data = []
+
+        def write_cmd(self, cmd):
+            pass
+
+        def write_data(self, buf):
+            self.data.append(bytes(buf))
+
+    # Clearing the display at boot uses the whole transfer buffer (and,
+    # because black can be represented exactly, 12-bit mode)
+    d = Recorder(240, 240, lines=4)
+    assert len(d.linebuffer) == 4 * 480
+    assert d.data[-46:] == [ bytes(4 * 480) ] * 45 + [ b'\x05' ]
+    assert d.depth == 16
+
+    # Small fills only write the pixels they need
+    d.data = []
+    d.fill(0xf800, 10, 10, 7, 3)
+    assert d.data[-1] == b'\xf8\x00' * 21
+
+    # Wrapping a large fill at the end of the buffer
+    d.fill(0x4a69, 0, 0, 240, 9)
+    assert d.data[-3:] == [ b'\x4a\x69' * 960 ] * 2 + [ b'\x4a\x69' * 240 ]
+
+def test_rgb444():
+    import wasp
+    from drivers.st7789 import ST7789
+
+    assert ST7789.rgb444(0x0000) == 0x000
+    assert ST7789.rgb444(0xffff) == 0xfff
+    assert ST7789.rgb444(0xf800) == 0xf00
+    assert ST7789.rgb444(0x4a69) == -1
+
+    buf = bytearray(b'\xf8\x00\x07\xe0\x00\x1f\xff\xff')
+    assert bytes(wasp.watch.display.pack444(buf, 4)) == b'\xf0\x00\xf0\x00\xff\xff'
+    buf = bytearray(b'\x00\xf8\xe0\x07')
+    assert bytes(wasp.watch.display.pack444(buf, 2, True)) == b'\xf0\x00\xf0'
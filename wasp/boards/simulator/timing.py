@@ -0,0 +1,109 @@
+# SPDX-License-Identifier: LGPL-3.0-or-later
+# Copyright (C) 2020 Daniel Thompson
+
+"""Estimate how long the real device would spend updating the display.
+
+The simulator runs much faster than the watch so slow redraws are easy
+to miss. The simulated display keeps a running estimate of the time the
+device would spend driving the display (see ``ST7789Sim.busy_us``) and
+this module uses it to attribute that time to app switches, system ticks
+and individual drawing calls.
+
+Set ``WASP_SIM_TIMING`` to enable the measurements when the simulator
+starts and to print a report when it exits.
+"""
+
+import display
+import wasp
+
+# Drawing methods to measure
+DRAW_METHODS = ('fill', 'blit', 'rleblit', 'string', 'line', 'lines',
+                'polar', 'circle', 'arc', 'rounded_rect', 'polygon', 'commit')
+
+costs = {}
+_drawing = [0]
+
+def busy_us():
+    """Get the estimated device time, in microseconds, spent so far."""
+    return display.spi_st7789_sim.busy_us
+
+def measure(fn, *args, **kwargs):
+    """Call a function and estimate how long it would take on the device.
+
+    Only the time spent driving the display is included in the estimate.
+
+    :returns: Tuple of the function's return value and the estimated time
+              in microseconds
+    """
+    start = busy_us()
+    result = fn(*args, **kwargs)
+    return (result, busy_us() - start)
+
+def _record(key, us):
+    cost = costs.get(key)
+    if not cost:
+        cost = [0, 0.0, 0.0]
+        costs[key] = cost
+    cost[0] += 1
+    cost[1] += us
+    if us > cost[2]:
+        cost[2] = us
+
+def _app_name(app):
+    return app.NAME if 'NAME' in dir(app) else '?'
+
+def install():
+    """Start recording the cost of every switch, tick and drawing call.
+
+    The results are accumulated in ``costs`` which is a dictionary keyed
+    by ``(kind, name)`` where each entry is a list of the number of calls
+    with a non-zero cost, the total estimated time and the most expensive
+    call.
+    """
+    system = wasp.system
+    if 'switch' in system.__dict__:
+        return
+
+    switch = system.switch
+    def timed_switch(app):
+        (result, us) = measure(switch, app)
+        _record(('switch', _app_name(app)), us)
+        return result
+    system.switch = timed_switch
+
+    tick = system._tick
+    def timed_tick():
+        app = system.app
+        (result, us) = measure(tick)
+        if us:
+            _record(('tick', _app_name(app)), us)
+        return result
+    system._tick = timed_tick
+
+    draw = wasp.watch.drawable
+    for name in DRAW_METHODS:
+        fn = getattr(draw, name, None)
+        if fn:
+            setattr(draw, name, _timed_draw(name, fn))
+
+def _timed_draw(name, fn):
+    def timed_draw(*args, **kwargs):
+        # Only the outermost drawing call is recorded
+        _drawing[0] += 1
+        try:
+            (result, us) = measure(fn, *args, **kwargs)
+        finally:
+            _drawing[0] -= 1
+        if not _drawing[0]:
+            _record(('draw', name), us)
+        return result
+    return timed_draw
+
+def report():
+    """Print the costs recorded since :py:func:`install` was called."""
+    fmt = '{:6} {:20} {:>6} {:>10} {:>10}'
+    print(fmt.format('Kind', 'Name', 'Calls', 'Mean (ms)', 'Max (ms)'))
+    for (key, cost) in sorted(costs.items(), key=lambda c: -c[1][1]):
+        print(fmt.format(key[0], key[1], cost[0],
+                         '{:.1f}'.format(cost[1] / cost[0] / 1000),
+                         '{:.1f}'.format(cost[2] / 1000)))
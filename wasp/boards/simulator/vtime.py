@@ -0,0 +1,91 @@
+# SPDX-License-Identifier: LGPL-3.0-or-later
+# Copyright (C) 2020 Daniel Thompson
+
+"""Virtual time source for the simulator.
+
+The simulated RTC, ``machine.Timer``, ``machine.lightsleep()`` and
+``time.sleep_ms()`` all take their time from this module rather than
+directly from the host's wall clock. By default virtual time runs at the
+same rate as real time but it can be advanced instantly, run faster (or
+slower) than real time or stopped altogether. When the clock is stopped
+sleeping simply advances the clock, which allows day long scenarios such
+as the step counter's midnight reset to be tested in a fraction of a
+second.
+
+Set ``WASP_SIM_SPEED`` to change the rate at which virtual time runs when
+the simulator starts (``0`` stops the clock so that it only moves when
+the watch sleeps).
+"""
+
+import os
+import time as _time
+
+class Clock(object):
+    def __init__(self, speed=1, start=None):
+        self._base = _time.time() if start is None else start
+        self._real = _time.monotonic()
+        self.speed = speed
+
+    def time(self):
+        """Get the current virtual time, in seconds since the epoch."""
+        t = self._base
+        if self.speed:
+            t += (_time.monotonic() - self._real) * self.speed
+        return t
+
+    def set_time(self, t):
+        """Jump to a new virtual time.
+
+        :param t: Seconds since the epoch
+        """
+        self._base = t
+        self._real = _time.monotonic()
+
+    def set_speed(self, speed):
+        """Change the rate at which virtual time runs.
+
+        :param speed: Multiple of real time (0 to stop the clock)
+        """
+        self.set_time(self.time())
+        self.speed = speed
+
+    def advance(self, secs):
+        """Move the virtual time forward instantly."""
+        self._base += secs
+
+    def sleep(self, secs):
+        """Sleep for the given amount of virtual time.
+
+        If the clock is running then this sleeps for a (scaled) period of
+        real time, otherwise the clock is advanced instantly.
+        """
+        if self.speed:
+            _time.sleep(secs / self.speed)
+        else:
+            self.advance(secs)
+
+SPEED = float(os.environ.get('WASP_SIM_SPEED', 1))
+clock = Clock(SPEED)
+
+time = clock.time
+set_time = clock.set_time
+set_speed = clock.set_speed
+advance = clock.advance
+sleep = clock.sleep
+
+def warp(secs, step=1):
+    """Advance virtual time whilst keeping the watch running.
+
+    The system manager is ticked after every ``step`` seconds of virtual
+    time so that alarms, app ticks and the sleep timer are all handled
+    much as they would be had the time passed normally.
+
+    :param secs: Number of seconds to advance
+    :param step: Virtual time between each system tick
+    """
+    import wasp
+
+    end = clock.time() + secs
+    while clock.time() < end:
+        clock.advance(min(step, end - clock.time()))
+        wasp.system._tick()
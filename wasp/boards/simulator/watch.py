@@ -2,8 +2,9 @@
 # Copyright (C) 2020 Daniel Thompson
 
 import time
+import vtime
 def sleep_ms(ms):
-    time.sleep(ms / 1000)
+    vtime.sleep(ms / 1000)
 time.sleep_ms = sleep_ms
 
 import sys, traceback
@@ -15,6 +16,7 @@ sys.print_exception = print_exception
 import array
 import draw565
 import os
+import streams
 import warnings
 
 from machine import I2C
@@ -32,12 +34,25 @@ class Accelerometer:
     is written in C. For that reason we simulate the accelerometer
     rather than emulate (by comparison we emulate the ST7789).
     """
+    def __init__(self, stream=None):
+        self._stream = stream
+        self.reset()
+
+    def _stream_steps(self):
+        (loops, i) = self._stream.position()
+        data = self._stream.data['steps']
+        return loops * int(data[-1]) + int(data[i])
+
     def reset(self):
         self._steps = 3
+        if self._stream:
+            self._steps = -self._stream_steps()
 
     @property
     def steps(self):
         """Report the number of steps counted."""
+        if self._stream:
+            return self._stream_steps() + self._steps
         if self._steps < 10000:
             self._steps = int(self._steps * 1.34)
         else:
@@ -49,7 +64,8 @@ class Accelerometer:
         self.reset()
 
     def accel_xyz(self):
-        # TODO randomly alter the values over time
+        if self._stream:
+            return tuple(int(v) for v in self._stream.sample()['xyz'])
         return (0,0,0)
 
 class Backlight(object):
@@ -68,10 +84,11 @@ class Backlight(object):
         button.value(bool(level))
 
 class Battery(object):
-    def __init__(self):
+    def __init__(self, stream=None):
         self.voltage = 4.1
         self.step = -0.01
         self.powered = False
+        self._stream = stream
 
     def charging(self):
         self.voltage_mv()
@@ -82,6 +99,12 @@ class Battery(object):
         return self.powered
 
     def voltage_mv(self):
+        if self._stream:
+            (mv, charging) = self._stream.sample()
+            self.voltage = mv / 1000
+            self.powered = bool(charging)
+            return int(mv)
+
         if self.voltage > 4:
             self.step = -0.01
             self.powered = False
@@ -103,11 +126,11 @@ class Battery(object):
 
 class RTC(object):
     def __init__(self):
-        self._epoch = time.time()
+        self._epoch = vtime.time()
         self._lasttime = 0
 
     def update(self):
-        now = time.time()
+        now = vtime.time()
         if now == self._lasttime:
             return False
         self._lasttime = now
@@ -121,18 +144,18 @@ class RTC(object):
         #if self.uptime < 60:
         #    # Jump back a little over a day
         #    return time.localtime(time.time() - 100000)
-        return time.localtime()[:8]
+        return time.localtime(vtime.time())[:8]
 
     def get_time(self):
         now = self.get_localtime()
         return (now[3], now[4], now[5])
 
     def time(self):
-        return time.time()
+        return vtime.time()
 
     @property
     def uptime(self):
-        return time.time() - self._epoch
+        return vtime.time() - self._epoch
 
     def get_uptime_ms(self):
         return int(self.uptime * 1000)
@@ -155,9 +178,10 @@ class HRS():
 9237,9237,9246,9246,9260,9260,9260,9270,9270,9269,9269,9269,9256,9256,9256,9256,
 9256,9263,9263,9274,9274,9274,9288,9288,9292,9292,9292,9307,9307,9310
 )
-    def __init__(self):
+    def __init__(self, stream=None):
         self._i = 0
         self._step = 1
+        self._stream = stream
 
     def read_reg(self, addr):
         pass
@@ -172,6 +196,9 @@ class HRS():
         pass
 
     def read_hrs(self):
+        if self._stream:
+            return self._stream.sample()
+
         d = self.DATA[self._i]
 
         self._i += self._step
@@ -196,13 +223,19 @@ spi.init(polarity=1, phase=1, baudrate=8000000)
 display = ST7789_SPI(240, 240, spi,
         cs=Pin("DISP_CS", Pin.OUT, quiet=True),
         dc=Pin("DISP_DC", Pin.OUT, quiet=True),
-        res=Pin("DISP_RST", Pin.OUT, quiet=True))
-drawable = draw565.Draw565(display)
+        res=Pin("DISP_RST", Pin.OUT, quiet=True),
+        lines=4)
+drawable = draw565.Draw565(display, glyph_cache=8192)
+
+# Compose the status bar off-screen (costs 12 KB of RAM, see widgets.py)
+statusbar_canvas = True
 
-accel = Accelerometer()
-battery = Battery()
+accel = Accelerometer(streams.from_env('WASP_SIM_ACCEL', streams.Stream,
+                                      streams.ACCEL, streams.ACCEL_RATE))
+battery = Battery(streams.from_env('WASP_SIM_BATTERY', streams.Stream,
+                                   streams.BATTERY, streams.BATTERY_RATE))
 button = Pin('BUTTON', Pin.IN, quiet=True)
-hrs = HRS()
+hrs = HRS(streams.from_env('WASP_SIM_HRS', streams.HRSStream))
 rtc = RTC()
 touch = CST816S(I2C(0), Pin('TP_INT', Pin.IN, quiet=True), Pin('TP_RST', Pin.OUT, quiet=True))
 vibrator = Vibrator(Pin('MOTOR', Pin.OUT, value=0), active_low=True)
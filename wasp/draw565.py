@@ -16,6 +16,20 @@ R = const(0b11111_000000_00000)
 G = const(0b00000_111111_00000)
 B = const(0b00000_000000_11111)
 
+# Drawing operations that can be recorded in a batch
+_FILL = const(0)
+_STRING = const(1)
+_BLIT = const(2)
+_RLEBLIT = const(3)
+_RAWBLIT = const(4)
+_LINE = const(5)
+_SHAPE = const(6)
+
+# Only split a fill around an occluding rectangle if doing so saves at
+# least this many pixels (each extra window costs ~11 bytes of commands)
+_MIN_SAVING = const(32)
+_MAX_FRAGMENTS = const(8)
+
 @micropython.viper
 def _bitblit(bitbuf, pixels, bgfg: int, count: int):
     mv = ptr16(bitbuf)
@@ -70,17 +84,445 @@ def _fill(mv, color: int, count: int, offset: int):
     for x in range(offset, offset+count):
         p[x] = color
 
+@micropython.viper
+def _rle2bit(display, image, palette, cap: int) -> int:
+    """Decode a 2-bit RLE image.
+
+    The whole opcode stream is interpreted here. Runs are expanded
+    directly into the display's line buffer which is written out every
+    time it is full (rather than at the end of every row of the image).
+
+    :param palette: Byte-swapped RGB565 colours for the four palette
+                    entries. Entries 1 to 3 are updated as the image is
+                    decoded.
+    :param cap:     Number of pixels in the line buffer
+    :returns:       Number of decoded pixels that have not yet been
+                    written out
+    """
+    img = ptr8(image)
+    pal = ptr16(palette)
+    linebuffer = display.linebuffer
+    buf = ptr16(linebuffer)
+    quick_write = display.quick_write
+
+    sz = int(len(image))
+    ip = 3
+    bp = 0
+    next_color = 1
+
+    while ip < sz:
+        op = img[ip]
+        ip += 1
+        px = op >> 6
+        rl = op & 0x3f
+
+        if rl == 0:
+            # Reprogram the next palette entry
+            c = int(_clut8_rgb565(img[ip]))
+            ip += 1
+            pal[next_color] = ((c >> 8) + (c << 8)) & 0xffff
+            if next_color < 3:
+                next_color += 1
+            else:
+                next_color = 1
+            continue
+
+        if rl == 63:
+            extend = True
+            while extend:
+                op = img[ip]
+                ip += 1
+                rl += op
+                extend = op == 255
+
+        color = pal[px]
+        while rl:
+            count = cap - bp
+            if rl < count:
+                count = rl
+            for i in range(bp, bp + count):
+                buf[i] = color
+            bp += count
+            rl -= count
+            if bp >= cap:
+                quick_write(linebuffer)
+                bp = 0
+
+    return bp
+
+@micropython.viper
+def _rle_indexed(display, image, palette, cap: int) -> int:
+    """Decode an indexed colour RLE image.
+
+    Runs are expanded directly into the display's line buffer which is
+    written out every time it is full.
+
+    :param palette: Byte-swapped RGB565 colour for every palette index
+    :param cap:     Number of pixels in the line buffer
+    :returns:       Number of decoded pixels that have not yet been
+                    written out
+    """
+    img = ptr8(image)
+    pal = ptr16(palette)
+    linebuffer = display.linebuffer
+    buf = ptr16(linebuffer)
+    quick_write = display.quick_write
+
+    depth = img[0]
+    sz = int(len(image))
+    ip = 4 + (img[3] if img[3] else 256)
+    bp = 0
+
+    while ip < sz:
+        op = img[ip]
+        ip += 1
+        if depth == 4:
+            px = op >> 4
+            rl = op & 0xf
+            extend = rl == 0xf
+        else:
+            px = op
+            rl = 0
+            extend = True
+        while extend:
+            op = img[ip]
+            ip += 1
+            rl += op
+            extend = op == 255
+
+        color = pal[px]
+        while rl:
+            count = cap - bp
+            if rl < count:
+                count = rl
+            for i in range(bp, bp + count):
+                buf[i] = color
+            bp += count
+            rl -= count
+            if bp >= cap:
+                quick_write(linebuffer)
+                bp = 0
+
+    return bp
+
+@micropython.native
+def _draw_line(display, buf, x0, y0, x1, y1, width):
+    """Draw a line using horizontal or vertical spans.
+
+    The line is traced using Bresenham's algorithm with a width x width
+    square brush. Rather than drawing the brush at every step we record
+    the extent of the path on every row (or, for steep lines, every
+    column) and then draw each row of the brushed line as a single span.
+    This means every pixel is drawn exactly once.
+
+    :param buf: Buffer already filled with the line colour
+    """
+    dw = (width - 1) // 2
+    x0 -= dw
+    y0 -= dw
+    x1 -= dw
+    y1 -= dw
+
+    dx =  abs(x1 - x0)
+    sx = 1 if x0 < x1 else -1
+    dy = -abs(y1 - y0)
+    sy = 1 if y0 < y1 else -1
+    err = dx + dy
+
+    if dx == 0 or dy == 0:
+        if x1 < x0 or y1 < y0:
+            x0, x1 = x1, x0
+            y0, y1 = y1, y0
+        w = width if dx == 0 else (dx + width)
+        h = width if dy == 0 else (-dy + width)
+        _span(display, buf, x0, y0, w, h)
+        return
+
+    # Trace the line, recording the extent of the path along the minor
+    # axis for each step of the major axis
+    steep = -dy > dx
+    if steep:
+        n = dx + 1
+        base = min(x0, x1)
+    else:
+        n = 1 - dy
+        base = min(y0, y1)
+    lo = [32767] * n
+    hi = [-32768] * n
+    while True:
+        if steep:
+            i = x0 - base
+            v = y0
+        else:
+            i = y0 - base
+            v = x0
+        if v < lo[i]:
+            lo[i] = v
+        if v > hi[i]:
+            hi[i] = v
+        if x0 == x1 and y0 == y1:
+            break
+        e2 = 2 * err
+        if e2 >= dy:
+            err += dy
+            x0 += sx
+        if e2 <= dx:
+            err += dx
+            y0 += sy
+
+    # Each row (or column) of the brushed line is the union of the
+    # brush at every point within width pixels of it
+    for i in range(n + width - 1):
+        a = 32767
+        b = -32768
+        for j in range(max(0, i - width + 1), min(n, i + 1)):
+            if lo[j] < a:
+                a = lo[j]
+            if hi[j] > b:
+                b = hi[j]
+        if steep:
+            _span(display, buf, base + i, a, 1, b + width - a)
+        else:
+            _span(display, buf, a, base + i, b + width - a, 1)
+
+@micropython.native
+def _span(display, buf, x, y, w, h):
+    """Fill a rectangle using a buffer that is already filled with colour.
+
+    :param buf: Buffer already filled with the fill colour
+    """
+    display.set_window(x, y, w, h)
+    cap = len(buf) // 2
+    remaining = w * h
+    while remaining > 0:
+        n = min(remaining, cap)
+        display.write_data(buf[0:2*n])
+        remaining -= n
+
+@micropython.native
+def _run(display, buf, runs, i, x, y, w):
+    """Add a single row span to a run of identical spans.
+
+    Spans with the same left edge and width on consecutive rows are drawn
+    using one window. The pending run is kept in ``runs[i]``, as a list of
+    [x, y, w, h], and is only drawn when it cannot be extended.
+
+    :param buf: Buffer already filled with the fill colour
+    """
+    run = runs[i]
+    h = run[3]
+    if h and run[0] == x and run[2] == w and run[1] + h == y:
+        run[3] = h + 1
+        return
+    if h:
+        _span(display, buf, run[0], run[1], run[2], h)
+    run[0] = x
+    run[1] = y
+    run[2] = w
+    run[3] = 1
+
+def _end_runs(display, buf, runs):
+    """Draw any runs that are still pending."""
+    for run in runs:
+        if run[3]:
+            _span(display, buf, run[0], run[1], run[2], run[3])
+
+@micropython.viper
+def _isqrt(n: int) -> int:
+    """Integer square root, rounded down."""
+    if n <= 0:
+        return 0
+    r = 0
+    bit = 1 << 30
+    while bit > n:
+        bit >>= 2
+    while bit:
+        if n >= r + bit:
+            n -= r + bit
+            r = (r >> 1) + bit
+        else:
+            r >>= 1
+        bit >>= 2
+    return r
+
+def _halfplane(s, c, y):
+    """Find the range of x for which ``s*y + c*x >= 0``.
+
+    :returns: Tuple of (lo, hi), inclusive. The range is empty if lo > hi.
+    """
+    if c > 0:
+        return (-((s * y) // c), 32767)
+    if c < 0:
+        return (-32768, (s * y) // -c)
+    if s * y >= 0:
+        return (-32768, 32767)
+    return (32767, -32768)
+
+@micropython.native
+def _draw_ring(display, buf, x, y, r, width, sector):
+    """Draw a filled circle, a ring or a sector of a ring.
+
+    Every row of the shape is made up of (at most) two spans, one on each
+    side of the hole in the middle of the ring. Each span is then clipped
+    against the sector (if there is one) and identical spans on adjacent
+    rows are drawn using a single window.
+
+    :param buf:    Buffer already filled with the shape colour
+    :param width:  Width of the ring, 0 for a filled circle
+    :param sector: None to draw the whole ring or a tuple of two pairs of
+                   half-plane coefficients together with a flag that
+                   selects whether the sector is the intersection or the
+                   union of the half-planes.
+    """
+    ri = r - width if width else 0
+    rr = r * r + r
+    ii = ri * ri + ri
+    runs = [[0, 0, 0, 0] for i in range(4)]
+    for dy in range(-r, r + 1):
+        ho = _isqrt(rr - dy * dy)
+        if ri > 0 and -ri <= dy <= ri:
+            hi = _isqrt(ii - dy * dy)
+            pieces = ((-ho, -hi - 1), (hi + 1, ho))
+        else:
+            pieces = ((-ho, ho),)
+
+        if sector:
+            (s0, c0, s1, c1, union) = sector
+            (l0, h0) = _halfplane(s0, c0, dy)
+            (l1, h1) = _halfplane(s1, c1, dy)
+
+        i = 0
+        for (a, b) in pieces:
+            if not sector:
+                if a <= b:
+                    _run(display, buf, runs, i, x + a, y + dy, b - a + 1)
+            elif not union:
+                lo = max(a, l0, l1)
+                hi = min(b, h0, h1)
+                if lo <= hi:
+                    _run(display, buf, runs, i, x + lo, y + dy, hi - lo + 1)
+            else:
+                # Clip against both half-planes and merge the results
+                # if they overlap
+                a0 = max(a, l0)
+                b0 = min(b, h0)
+                a1 = max(a, l1)
+                b1 = min(b, h1)
+                if a0 > b0:
+                    (a0, b0) = (a1, b1)
+                elif a1 <= b1:
+                    if b1 + 1 < a0 or b0 + 1 < a1:
+                        _run(display, buf, runs, i + 1, x + a1, y + dy,
+                             b1 - a1 + 1)
+                    else:
+                        a0 = min(a0, a1)
+                        b0 = max(b0, b1)
+                if a0 <= b0:
+                    _run(display, buf, runs, i, x + a0, y + dy, b0 - a0 + 1)
+            i += 2
+    _end_runs(display, buf, runs)
+
+def _corner(w, h, r, j):
+    """Find the extent of row j of a w x h rectangle with rounded corners.
+
+    :returns: Tuple of (left, right), inclusive and relative to the left
+              edge of the rectangle.
+    """
+    if j < r:
+        dy = r - j
+    elif j >= h - r:
+        dy = j - h + 1 + r
+    else:
+        return (0, w - 1)
+    hw = _isqrt(r * r + r - dy * dy)
+    return (r - hw, w - 1 - r + hw)
+
+@micropython.native
+def _draw_rrect(display, buf, x, y, w, h, r, width):
+    """Draw a rectangle with rounded corners.
+
+    Only the rows that pass through the corners need to be drawn a span at
+    a time (and identical spans on adjacent rows share a window). The
+    straight part in the middle is drawn using a single window (or, for an
+    outline, one window for each side).
+
+    :param buf:   Buffer already filled with the shape colour
+    :param width: Width of the outline, 0 for a filled rectangle
+    """
+    r = min(r, w // 2, h // 2)
+    if width and (2 * width >= w or 2 * width >= h):
+        width = 0
+    m = max(r, width)
+    ri = max(r - width, 0)
+
+    if h > 2 * m:
+        if width:
+            _span(display, buf, x, y + m, width, h - 2 * m)
+            _span(display, buf, x + w - width, y + m, width, h - 2 * m)
+        else:
+            _span(display, buf, x, y + m, w, h - 2 * m)
+
+    runs = [[0, 0, 0, 0], [0, 0, 0, 0]]
+    for j in range(h):
+        if m <= j < h - m:
+            continue
+        (a, b) = _corner(w, h, r, j)
+        if width and width <= j < h - width:
+            (il, ir) = _corner(w - 2 * width, h - 2 * width, ri, j - width)
+            if width + il > a:
+                _run(display, buf, runs, 0, x + a, y + j, width + il - a)
+            if b > width + ir:
+                _run(display, buf, runs, 1, x + width + ir + 1, y + j,
+                     b - width - ir)
+        else:
+            _run(display, buf, runs, 0, x + a, y + j, b - a + 1)
+    _end_runs(display, buf, runs)
+
+@micropython.native
+def _draw_polygon(display, buf, points):
+    """Draw a filled convex polygon.
+
+    Each row of a convex polygon is a single span that runs between the
+    left-most and right-most edge crossing on that row. Identical spans on
+    adjacent rows (for example, between two vertical edges) are drawn
+    using a single window.
+
+    :param buf: Buffer already filled with the shape colour
+    """
+    n = len(points)
+    y0 = 32767
+    y1 = -32768
+    for (_, y) in points:
+        y0 = min(y0, y)
+        y1 = max(y1, y)
+    runs = [[0, 0, 0, 0]]
+    for y in range(y0, y1 + 1):
+        a = 32767
+        b = -32768
+        (xa, ya) = points[n-1]
+        for (xb, yb) in points:
+            if ya == yb:
+                if y == ya:
+                    a = min(a, xa, xb)
+                    b = max(b, xa, xb)
+            elif min(ya, yb) <= y <= max(ya, yb):
+                num = (y - ya) * (xb - xa)
+                den = yb - ya
+                if den < 0:
+                    num = -num
+                    den = -den
+                xi = xa + (2 * num + den) // (2 * den)
+                a = min(a, xi)
+                b = max(b, xi)
+            (xa, ya) = (xb, yb)
+        if a <= b:
+            _run(display, buf, runs, 0, a, y, b - a + 1)
+    _end_runs(display, buf, runs)
+
 def _bounding_box(s, font):
     if not s:
         return (0, font.height())
-
-    get_ch = font.get_ch
-    w = len(s)
-    for ch in s:
-        (_, h, wc) = get_ch(ch)
-        w += wc
-
-    return (w, h)
+    return (fonts.measure(font, s), font.height())
 
 @micropython.native
 def _draw_glyph(display, glyph, x, y, bgfg):
@@ -100,6 +542,258 @@ def _draw_glyph(display, glyph, x, y, bgfg):
         quick_write(buf)
     display.quick_end()
 
+@micropython.native
+def _draw_run(display, glyphs, x, y, lead, total, h, bgfg):
+    """Draw a run of glyphs using a single window.
+
+    The run is streamed one scanline at a time across all of the glyphs.
+    Any padding (and the spacing between glyphs) is filled in with the
+    background colour once and is then left untouched as each scanline
+    is overwritten.
+    """
+    buf = display.linebuffer[0:2*total]
+    _fill(buf, bgfg >> 16, total, 0)
+
+    display.set_window(x, y, total, h)
+    quick_write = display.quick_write
+
+    display.quick_start()
+    for row in range(h):
+        offset = 2 * lead
+        for (px, w, bytes_per_row) in glyphs:
+            if bytes_per_row:
+                _bitblit(buf[offset:], px[row*bytes_per_row:], bgfg, w - 1)
+            else:
+                stride = 2 * w
+                start = row * stride
+                buf[offset:offset+stride] = px[start:start+stride]
+            offset += 2 * w
+        quick_write(buf)
+    display.quick_end()
+
+def _render_glyph(glyph, bgfg):
+    """Expand a glyph (and its spacing column) into RGB565 pixels."""
+    (px, h, w) = glyph
+    stride = 2 * (w + 1)
+    bytes_per_row = (w + 7) // 8
+    pixels = bytearray(stride * h)
+    mv = memoryview(pixels)
+
+    for row in range(h):
+        offset = row * stride
+        _bitblit(mv[offset:], px[row*bytes_per_row:], bgfg, w)
+        mv[offset + 2*w] = bgfg >> 24
+        mv[offset + 2*w + 1] = (bgfg >> 16) & 0xff
+
+    return pixels
+
+class GlyphCache():
+    """Least recently used cache of rendered glyphs.
+
+    Glyphs are stored fully expanded into RGB565 pixels so a cached glyph
+    can be sent to the display with a single write. The cache is keyed by
+    font, character and colour and holds at most ``budget`` bytes of pixel
+    data. When the budget is exhausted the least recently used glyphs are
+    evicted.
+
+    .. data:: hits
+
+        Number of glyphs that were found in the cache.
+
+    .. data:: misses
+
+        Number of glyphs that had to be rendered.
+    """
+    def __init__(self, budget=0):
+        """Create an empty cache.
+
+        :param int budget: Maximum number of bytes of pixel data to cache,
+                           0 disables the cache
+        """
+        self.budget = budget
+        self.used = 0
+        self.hits = 0
+        self.misses = 0
+        self._glyphs = {}
+        self._lru = []
+
+    def clear(self):
+        """Discard every glyph in the cache."""
+        self.used = 0
+        self._glyphs = {}
+        self._lru = []
+
+    def get(self, font, ch, bgfg):
+        """Get the rendered pixels for a glyph.
+
+        The glyph will be rendered, and added to the cache, if it is not
+        already present. Glyphs that are larger than the entire budget
+        will be rendered but not cached.
+
+        :returns: Tuple of (pixels, width, height). The width includes
+                  the column of spacing to the right of the glyph.
+        """
+        key = (font, ch, bgfg)
+        glyphs = self._glyphs
+        lru = self._lru
+
+        if key in glyphs:
+            self.hits += 1
+            if lru[-1] != key:
+                lru.remove(key)
+                lru.append(key)
+            return glyphs[key]
+        self.misses += 1
+
+        glyph = font.get_ch(ch)
+        entry = (_render_glyph(glyph, bgfg), glyph[2] + 1, glyph[1])
+        sz = len(entry[0])
+        if sz > self.budget:
+            return entry
+
+        while self.used + sz > self.budget:
+            old = lru.pop(0)
+            self.used -= len(glyphs.pop(old)[0])
+        glyphs[key] = entry
+        lru.append(key)
+        self.used += sz
+
+        return entry
+
+def _intersect(a, b):
+    """Calculate the intersection of two (x, y, w, h, ...) rectangles."""
+    x = max(a[0], b[0])
+    y = max(a[1], b[1])
+    w = min(a[0] + a[2], b[0] + b[2]) - x
+    h = min(a[1] + a[3], b[1] + b[3]) - y
+    if w <= 0 or h <= 0:
+        return None
+    return (x, y, w, h)
+
+def _contains(a, b):
+    """Check whether rectangle a completely covers rectangle b."""
+    return a[0] <= b[0] and a[1] <= b[1] and \
+           a[0] + a[2] >= b[0] + b[2] and a[1] + a[3] >= b[1] + b[3]
+
+def _subtract(op, occluders):
+    """Split a fill operation into the fragments that remain visible.
+
+    A fragment is only split if doing so saves enough pixels to pay for
+    the extra window commands.
+    """
+    fragments = [op]
+    for occ in occluders:
+        remaining = []
+        for f in fragments:
+            i = _intersect(f, occ)
+            if not i or i[2] * i[3] < _MIN_SAVING:
+                remaining.append(f)
+                continue
+
+            (x, y, w, h) = f[0:4]
+            (ix, iy, iw, ih) = i
+            for r in ((x, y, w, iy - y),
+                      (x, iy + ih, w, y + h - iy - ih),
+                      (x, iy, ix - x, ih),
+                      (ix + iw, iy, x + w - ix - iw, ih)):
+                if r[2] > 0 and r[3] > 0:
+                    remaining.append(r + f[4:])
+        if len(remaining) > _MAX_FRAGMENTS:
+            return fragments
+        fragments = remaining
+    return fragments
+
+def _composite(batch):
+    """Reduce a batch of drawing operations to the minimum needed.
+
+    Each operation is a tuple of (x, y, w, h, kind, args, bgfg, font).
+    Operations that are entirely hidden by a later (opaque) operation are
+    dropped, fills are trimmed to the parts that remain visible and then
+    adjacent fills of the same colour are merged into a single window.
+
+    :returns: List of the operations that must be drawn, in order
+    """
+    # Walk backwards so that every operation can be compared against
+    # the opaque operations that will be drawn on top of it
+    visible = []
+    occluders = []
+    for op in reversed(batch):
+        hidden = False
+        for occ in occluders:
+            if _contains(occ, op):
+                hidden = True
+                break
+        if hidden:
+            continue
+
+        if op[4] == _FILL:
+            # Fragments are generated in top-to-bottom order but we
+            # are building the list backwards
+            fragments = _subtract(op, occluders)
+            for i in range(len(fragments)-1, -1, -1):
+                visible.append(fragments[i])
+        else:
+            visible.append(op)
+
+        if op[4] < _LINE:
+            occluders.append(op)
+    visible.reverse()
+
+    # Merge adjacent fills of the same colour
+    ops = []
+    for op in visible:
+        if ops and op[4] == _FILL and ops[-1][4] == _FILL \
+               and op[5] == ops[-1][5]:
+            prev = ops[-1]
+            if prev[0] == op[0] and prev[2] == op[2] and \
+                    prev[1] + prev[3] == op[1]:
+                ops[-1] = (prev[0], prev[1], prev[2], prev[3] + op[3]) + \
+                          prev[4:]
+                continue
+            if prev[1] == op[1] and prev[3] == op[3] and \
+                    prev[0] + prev[2] == op[0]:
+                ops[-1] = (prev[0], prev[1], prev[2] + op[2], prev[3]) + \
+                          prev[4:]
+                continue
+        ops.append(op)
+
+    return ops
+
+def _wrap(s, width, end, font):
+    """Generator that finds the line breaks needed to wrap a string."""
+    widths = fonts.widths(font)
+    lo = font.min_ch()
+    hi = font.max_ch()
+    max = len(s)
+
+    while end < max:
+        start = end
+        l = 0
+
+        for i in range(start, max+1):
+            if i >= max:
+                end = i
+                break
+            ch = s[i]
+            oc = ord(ch)
+            l += widths[oc - lo + 1] if lo <= oc <= hi else widths[0]
+            if l > width:
+                if end <= start:
+                    # Always make progress, even if a single character
+                    # is too wide to fit
+                    end = i if i > start else i + 1
+                break
+
+            # Break the line immediately if requested
+            if ch == '\n':
+                end = i+1
+                break
+
+            # Remember the right-most place we can cleanly break the line
+            if ch == ' ':
+                end = i+1
+        yield end
+
 class Draw565(object):
     """Drawing library for RGB565 displays.
 
@@ -109,22 +803,117 @@ class Draw565(object):
     .. automethod:: __init__
     """
 
-    def __init__(self, display):
+    def __init__(self, display, glyph_cache=0):
         """Initialise the library.
 
         Defaults to white-on-black for monochrome drawing operations
         and 24pt Sans Serif text.
+
+        :param display:         Display driver to draw on
+        :param int glyph_cache: Size, in bytes, of the
+                                :py:class:`GlyphCache` used to speed up
+                                :py:meth:`~.string`. Defaults to 0 (no
+                                caching).
         """
         self._display = display
+        self._rgb444 = 'set_depth' in dir(display)
+        self.glyph_cache = GlyphCache(glyph_cache)
         self.reset()
 
     def reset(self):
         """Restore the default colours and font.
 
         Default colours are white-on-block (white foreground, black
-        background) and the default font is 24pt Sans Serif."""
+        background) and the default font is 24pt Sans Serif. Any batch
+        that is still open will be discarded."""
         self.set_color(0xffff)
         self.set_font(fonts.sans24)
+        self._batch = None
+        self._depth = 0
+
+    def begin(self):
+        """Start recording a batch of drawing operations.
+
+        Whilst a batch is open then :py:meth:`~.fill`, :py:meth:`~.string`,
+        :py:meth:`~.blit` and :py:meth:`~.line` are recorded rather than
+        being sent straight to the display. Nothing is drawn until
+        :py:meth:`~.commit` is called.
+
+        Example:
+
+        .. code-block:: python
+
+            draw = wasp.watch.drawable
+            draw.begin()
+            draw.fill()
+            draw.string('Hello', 0, 108, width=240)
+            draw.commit()
+
+        Batches can be nested, in which case nothing is drawn until the
+        outermost batch is committed. Anything written directly to the
+        display driver whilst a batch is open will be drawn immediately
+        (and may be overdrawn when the batch is committed).
+        """
+        if not self._depth:
+            self._batch = []
+        self._depth += 1
+
+    def commit(self):
+        """Draw the operations recorded since :py:meth:`~.begin`.
+
+        Any operation that is completely hidden by a later operation
+        is dropped, fills are trimmed to the parts that remain visible and
+        adjacent fills of the same colour are merged. This allows each
+        damaged region to be sent to the display only once.
+
+        :returns: Bounding box of the damaged region as a tuple of
+                  (x, y, w, h), or None if nothing was drawn
+        """
+        self._depth -= 1
+        if self._depth > 0:
+            return None
+        self._depth = 0
+        batch = self._batch
+        self._batch = None
+        if not batch:
+            return None
+
+        bgfg = self._bgfg
+        font = self._font
+        x0 = y0 = 1 << 16
+        x1 = y1 = -(1 << 16)
+
+        for op in _composite(batch):
+            (x, y, w, h, kind, args) = op[0:6]
+            self._bgfg = op[6]
+            self._font = op[7]
+            if kind == _FILL:
+                self.fill(args, x, y, w, h)
+            elif kind == _STRING:
+                self.string(args[0], args[1], y, args[2], args[3])
+            elif kind == _BLIT:
+                self.blit(args[0], x, y, args[1], args[2], args[3])
+            elif kind == _RLEBLIT:
+                self.rleblit(args[0], (x, y), args[1], args[2])
+            elif kind == _RAWBLIT:
+                args[0](args[1], x, y, w, h)
+            elif kind == _LINE:
+                self.line(*args)
+            else:
+                args[0](*args[1:])
+
+            x0 = min(x0, x)
+            y0 = min(y0, y)
+            x1 = max(x1, x + w)
+            y1 = max(y1, y + h)
+
+        self._bgfg = bgfg
+        self._font = font
+        return (x0, y0, x1 - x0, y1 - y0)
+
+    def _record(self, x, y, w, h, kind, args):
+        """Add an operation to the current batch."""
+        self._batch.append((x, y, w, h, kind, args, self._bgfg, self._font))
 
     def fill(self, bg=None, x=0, y=0, w=None, h=None):
         """Draw a solid colour rectangle.
@@ -149,11 +938,22 @@ class Draw565(object):
             w = display.width - x
         if h is None:
             h = display.height - y
-
-        display.set_window(x, y, w, h)
+        if w <= 0 or h <= 0:
+            return
+        if self._batch is not None:
+            self._record(x, y, w, h, _FILL, bg)
+            return
 
         remaining = w * h
 
+        # Let the driver send large fills in 12-bit mode if it can
+        if self._rgb444 and remaining >= 2 * display.width and \
+                not remaining & 1 and display.rgb444(bg) >= 0:
+            display.fill(bg, x, y, w, h)
+            return
+
+        display.set_window(x, y, w, h)
+
         # Populate the line buffer
         buf = display.linebuffer
         sz = len(buf) // 2
@@ -171,17 +971,30 @@ class Draw565(object):
     def blit(self, image, x, y, fg=0xffff, c1=0x4a69, c2=0x7bef):
         """Decode and draw an encoded image.
 
-        :param image: Image data in either 1-bit RLE or 2-bit RLE formats. The
-                      format will be autodetected
+        :param image: Image data in 1-bit RLE, 2-bit RLE or indexed colour
+                      (4-bit or 8-bit) RLE formats. The format will be
+                      autodetected
         :param x: X coordinate for the left-most pixels in the image
         :param y: Y coordinate for the top-most pixels in the image
         """
+        if self._batch is not None:
+            if len(image) == 3:
+                self._record(x, y, image[0], image[1], _BLIT,
+                             (image, fg, c1, c2))
+            else:
+                self._record(x, y, image[1], image[2], _BLIT,
+                             (image, fg, c1, c2))
+            return
+
         if len(image) == 3:
             # Legacy 1-bit image
             self.rleblit(image, (x, y), fg)
-        else: #elif image[0] == 2:
+        elif image[0] == 2:
             # 2-bit RLE image, (255x255, v1)
             self._rle2bit(image, x, y, fg, c1, c2)
+        else:
+            # Indexed colour RLE image, 4-bit or 8-bit (255x255)
+            self._rle_indexed(image, x, y)
 
     @micropython.native
     def rleblit(self, image, pos=(0, 0), fg=0xffff, bg=0):
@@ -190,6 +1003,11 @@ class Draw565(object):
         .. deprecated:: M2
             Use :py:meth:`~.blit` instead.
         """
+        if self._batch is not None:
+            self._record(pos[0], pos[1], image[0], image[1], _RLEBLIT,
+                         (image, fg, bg))
+            return
+
         display = self._display
         write_data = display.write_data
         (sx, sy, rle) = image
@@ -220,55 +1038,48 @@ class Draw565(object):
     def _rle2bit(self, image, x, y, fg, c1, c2):
         """Decode and draw a 2-bit RLE image."""
         display = self._display
-        quick_write = display.quick_write
-        sx = image[1]
-        sy = image[2]
-        rle = memoryview(image)[3:]
-
-        display.set_window(x, y, sx, sy)
-
-        if sx <= (len(display.linebuffer) // 4) and not bool(sy & 1):
-            sx *= 2
-            sy //= 2
-
         palette = array.array('H', (0, c1, c2, fg))
-        next_color = 1
-        rl = 0
-        buf = display.linebuffer[0:2*sx]
-        bp = 0
+        for i in range(1, 4):
+            c = palette[i]
+            palette[i] = ((c >> 8) + (c << 8)) & 0xffff
 
+        display.set_window(x, y, image[1], image[2])
         display.quick_start()
-        for op in rle:
-            if rl == 0:
-                px = op >> 6
-                rl = op & 0x3f
-                if 0 == rl:
-                    rl = -1
-                    continue
-                if rl >= 63:
-                    continue
-            elif rl > 0:
-                rl += op
-                if op >= 255:
-                    continue
-            else:
-                palette[next_color] = _clut8_rgb565(op)
-                if next_color < 3:
-                    next_color += 1
-                else:
-                    next_color = 1
-                rl = 0
-                continue
+        bp = _rle2bit(display, image, palette, len(display.linebuffer) // 2)
+        if bp:
+            display.quick_write(display.linebuffer[0:2*bp])
+        display.quick_end()
 
-            while rl:
-                count = min(sx - bp, rl)
-                _fill(buf, palette[px], count, bp)
-                bp += count
-                rl -= count
+    @micropython.native
+    def _rle_indexed(self, image, x, y):
+        """Decode and draw an indexed colour RLE image.
+
+        The image starts with a four byte header (depth, width, height and
+        the number of palette entries, where 0 means 256) followed by the
+        palette. Each palette entry is an index into the same 256 colour
+        CLUT used by 2-bit images.
+
+        The palette is followed by the runs. For 4-bit images each run is
+        a single byte with the palette index in the top four bits and the
+        run length in the bottom four. For 8-bit images each run is the
+        palette index followed by a byte containing the run length. In
+        both cases a run length of 15 (4-bit) or 255 (8-bit) means that
+        the following byte should be added to the run length, allowing
+        runs of any length to be encoded.
+        """
+        display = self._display
+        n = image[3] if image[3] else 256
+        palette = array.array('H', range(n))
+        for i in range(n):
+            c = _clut8_rgb565(image[4+i])
+            palette[i] = ((c >> 8) + (c << 8)) & 0xffff
 
-                if bp >= sx:
-                    quick_write(buf)
-                    bp = 0
+        display.set_window(x, y, image[1], image[2])
+        display.quick_start()
+        bp = _rle_indexed(display, image, palette,
+                          len(display.linebuffer) // 2)
+        if bp:
+            display.quick_write(display.linebuffer[0:2*bp])
         display.quick_end()
 
     def set_color(self, color, bg=0):
@@ -310,24 +1121,70 @@ class Draw565(object):
         font = self._font
         bg = self._bgfg >> 16
 
-        if width:
+        if self._batch is not None:
             (w, h) = _bounding_box(s, font)
+            bx = x
+            if width:
+                if w > width:
+                    bx += (width - w) if right else (width - w) // 2
+                else:
+                    w = width
+            self._record(bx, y, w, h, _STRING, (s, x, width, right))
+            return
+
+        # Gather the glyphs. Each one is described by a tuple of
+        # (pixels, width, bytes_per_row) where the width includes the
+        # spacing column and bytes_per_row is 0 if the glyph has already
+        # been expanded into RGB565 pixels.
+        glyphs = []
+        w = 0
+        cache = self.glyph_cache
+        if cache.budget:
+            get = cache.get
+            for ch in s:
+                (px, wc, h) = get(font, ch, bgfg)
+                glyphs.append((memoryview(px), wc, 0))
+                w += wc
+        else:
+            get_ch = font.get_ch
+            for ch in s:
+                (px, h, wc) = get_ch(ch)
+                glyphs.append((px, wc + 1, (wc + 7) // 8))
+                w += wc + 1
+        h = font.height()
+
+        leftpad = 0
+        rightpad = 0
+        if width:
             if right:
                 leftpad = width - w
-                rightpad = 0
             else:
                 leftpad = (width - w) // 2
-                rightpad = width - w - leftpad
-            self.fill(bg, x, y, leftpad, h)
-            x += leftpad
+            rightpad = width - w - leftpad
+            if leftpad < 0:
+                x += leftpad
+                leftpad = 0
+            if rightpad < 0:
+                rightpad = 0
+        total = leftpad + w + rightpad
+        if not total:
+            return
 
-        for ch in s:
-            glyph = font.get_ch(ch)
-            _draw_glyph(display, glyph, x, y, bgfg)
-            x += glyph[2] + 1
+        if 2 * total <= len(display.linebuffer):
+            _draw_run(display, glyphs, x, y, leftpad, total, h, bgfg)
+            return
 
-        if width:
-            self.fill(bg, x, y, rightpad, h)
+        # The string is too wide to render as a single run
+        self.fill(bg, x, y, leftpad, h)
+        x += leftpad
+        for (px, wc, bytes_per_row) in glyphs:
+            if bytes_per_row:
+                _draw_glyph(display, (px, h, wc - 1), x, y, bgfg)
+            else:
+                display.set_window(x, y, wc, h)
+                display.write_data(px)
+            x += wc
+        self.fill(bg, x, y, rightpad, h)
 
     def bounding_box(self, s):
         """Return the bounding box of a string.
@@ -337,6 +1194,24 @@ class Draw565(object):
         """
         return _bounding_box(s, self._font)
 
+    def measure(self, s):
+        """Measure the width of a string in the current font.
+
+        :param s: A string
+        :returns: Width of the string in pixels
+        """
+        return fonts.measure(self._font, s)
+
+    def fit(self, s, width):
+        """Find how many characters of a string fit within a given width.
+
+        :param s:     A string
+        :param width: Width available, in pixels
+        :returns:     Number of characters, from the start of the string,
+                      that will fit
+        """
+        return fonts.fit(self._font, s, width)
+
     def wrap(self, s, width):
         """Chunk a string so it can rendered within a specified width.
 
@@ -356,38 +1231,38 @@ class Draw565(object):
         :param width: Width to wrap the text into
         :returns:     List of chunk boundaries
         """
-        font = self._font
-        max = len(s)
         chunks = [ 0, ]
-        end = 0
+        for end in self.wrap_iter(s, width):
+            chunks.append(end)
+        return chunks
 
-        while end < max:
-            start = end
-            l = 0
+    def wrap_iter(self, s, width, start=0):
+        """Lazily chunk a string so it can be rendered within a given width.
 
-            for i in range(start, max+1):
-                if i >= max:
-                    end = i
-                    break
-                ch = s[i]
-                (_, h, w) = font.get_ch(ch)
-                l += w + 1
-                if l > width:
-                    if end <= start:
-                        end = i
-                    break
+        This is a generator version of :py:meth:`~.wrap`. Line breaks are
+        found one at a time, as they are needed, so the time taken to
+        show the first few lines does not depend on the length of the
+        string.
 
-                # Break the line immediately if requested
-                if ch == '\n':
-                    end = i+1
-                    break
+        Example:
 
-                # Remember the right-most place we can cleanly break the line
-                if ch == ' ':
-                    end = i+1
-            chunks.append(end)
+        .. code-block:: python
 
-        return chunks
+            draw = wasp.watch.drawable
+            start = 0
+            for (i, end) in enumerate(draw.wrap_iter(long_string, 240)):
+                draw.string(long_string[start:end].rstrip(), 0, 24*i)
+                start = end
+                if i == 9:
+                    break
+
+        :param s:     String to be chunked
+        :param width: Width to wrap the text into
+        :param start: Index of the first character to wrap (which must be
+                      the start of a line)
+        :returns:     Generator producing the end of each line
+        """
+        return _wrap(s, width, start, self._font)
 
     def line(self, x0, y0, x1, y1, width=1, color=None):
         """Draw a line between points (x0, y0) and (x1, y1).
@@ -408,42 +1283,48 @@ class Draw565(object):
         """
         if color is None:
             color = self._bgfg & 0xffff
-        px = bytes(((color >> 8) & 0xFF, color & 0xFF)) * (width * width)
-        write_data = self._display.write_data
-        set_window = self._display.set_window
-
-        dw = (width - 1) // 2
-        x0 -= dw
-        y0 -= dw
-        x1 -= dw
-        y1 -= dw
-
-        dx =  abs(x1 - x0)
-        sx = 1 if x0 < x1 else -1
-        dy = -abs(y1 - y0)
-        sy = 1 if y0 < y1 else -1
-        err = dx + dy
-        if dx == 0 or dy == 0:
-            if x1 < x0 or y1 < y0:
-                x0, x1 = x1, x0
-                y0, y1 = y1, y0
-            w = width if dx == 0 else (dx + width)
-            h = width if dy == 0 else (-dy + width)
-            self.fill(color, x0, y0, w, h)
+        if self._batch is not None:
+            dw = (width - 1) // 2
+            x = min(x0, x1) - dw
+            y = min(y0, y1) - dw
+            self._record(x, y, abs(x1 - x0) + width, abs(y1 - y0) + width,
+                         _LINE, (x0, y0, x1, y1, width, color))
             return
-        while True:
-            set_window(x0, y0, width, width)
-            write_data(px)
-            if x0 == x1 and y0 == y1:
-                break
-            e2 = 2 * err
-            if e2 >= dy:
-                err += dy
-                x0 += sx
-            if e2 <= dx:
-                err += dx;
-                y0 += sy;
-        
+        display = self._display
+        buf = display.linebuffer
+        _fill(buf, color, len(buf) // 2, 0)
+        _draw_line(display, buf, x0, y0, x1, y1, width)
+
+    def lines(self, segments, width=1, color=None):
+        """Draw several lines of the same width and colour.
+
+        This is faster than calling :py:meth:`~.line` repeatedly because
+        the colour only needs to be prepared once.
+
+        Example:
+
+        .. code-block:: python
+
+            draw = wasp.watch.drawable
+            draw.lines(((0, 0, 239, 239), (0, 239, 239, 0)), 3, 0xf800)
+
+        :param segments: Sequence of (x0, y0, x1, y1) tuples, one for each line
+        :param width: Width of the lines in pixels
+        :param color: Colour to draw lines, defaults to the foreground colour
+        """
+        if color is None:
+            color = self._bgfg & 0xffff
+        if self._batch is not None:
+            for (x0, y0, x1, y1) in segments:
+                self.line(x0, y0, x1, y1, width, color)
+            return
+
+        display = self._display
+        buf = display.linebuffer
+        _fill(buf, color, len(buf) // 2, 0)
+        for (x0, y0, x1, y1) in segments:
+            _draw_line(display, buf, x0, y0, x1, y1, width)
+
     def polar(self, x, y, theta, r0, r1, width=1, color=None):
         """Draw a line using polar coordinates.
 
@@ -478,6 +1359,141 @@ class Draw565(object):
 
         self.line(x0, y0, x1, y1, width, color)
 
+    def circle(self, x, y, r, width=0, color=None):
+        """Draw a circle.
+
+        Example:
+
+        .. code-block:: python
+
+            draw = wasp.watch.drawable
+            draw.circle(120, 120, 100, 8, 0x07e0)
+
+        :param x: X coordinate of the centre of the circle
+        :param y: Y coordinate of the centre of the circle
+        :param r: Radius of the circle
+        :param width: Width of the outline in pixels, 0 for a filled circle
+        :param color: Colour to draw circle, defaults to the foreground colour
+        """
+        self._ring(x, y, r, width, color, None)
+
+    def arc(self, x, y, r, theta0, theta1, width=1, color=None):
+        """Draw an arc (a sector of a ring).
+
+        The angles use the same navigational conventions as
+        :py:meth:`~.polar`; the arc is drawn clockwise from theta0 to
+        theta1. This makes it easy to draw progress rings and gauges.
+
+        Example:
+
+        .. code-block:: python
+
+            draw = wasp.watch.drawable
+            draw.arc(120, 120, 100, 0, 360 * percent // 100, 12, 0x07e0)
+
+        :param x: X coordinate of the centre of the arc
+        :param y: Y coordinate of the centre of the arc
+        :param r: Outer radius of the arc
+        :param theta0: Angle of the start of the arc, in degrees
+        :param theta1: Angle of the end of the arc, in degrees
+        :param width: Width of the arc in pixels, 0 to draw a filled sector
+        :param color: Colour to draw arc, defaults to the foreground colour
+        """
+        if theta1 - theta0 >= 360:
+            sector = None
+        else:
+            sweep = (theta1 - theta0) % 360
+            if not sweep:
+                return
+            to_radians = math.pi / 180
+            t0 = theta0 * to_radians
+            t1 = theta1 * to_radians
+            sector = (int(math.sin(t0) * 4096), int(math.cos(t0) * 4096),
+                      -int(math.sin(t1) * 4096), -int(math.cos(t1) * 4096),
+                      sweep > 180)
+        self._ring(x, y, r, width, color, sector)
+
+    def _ring(self, x, y, r, width, color, sector):
+        if color is None:
+            color = self._bgfg & 0xffff
+        if self._batch is not None:
+            self._record(x - r, y - r, 2 * r + 1, 2 * r + 1, _SHAPE,
+                         (self._ring, x, y, r, width, color, sector))
+            return
+        display = self._display
+        buf = display.linebuffer
+        _fill(buf, color, len(buf) // 2, 0)
+        _draw_ring(display, buf, x, y, r, width, sector)
+
+    def rounded_rect(self, x, y, w, h, r, width=0, color=None):
+        """Draw a rectangle with rounded corners.
+
+        Example:
+
+        .. code-block:: python
+
+            draw = wasp.watch.drawable
+            draw.rounded_rect(20, 180, 200, 48, 12, 0, 0x001f)
+
+        :param x: X coordinate of the left edge of the rectangle
+        :param y: Y coordinate of the top edge of the rectangle
+        :param w: Width of the rectangle
+        :param h: Height of the rectangle
+        :param r: Radius of the corners
+        :param width: Width of the outline in pixels, 0 for a filled rectangle
+        :param color: Colour to draw rectangle, defaults to the foreground
+                      colour
+        """
+        if w <= 0 or h <= 0:
+            return
+        if color is None:
+            color = self._bgfg & 0xffff
+        if self._batch is not None:
+            self._record(x, y, w, h, _SHAPE,
+                         (self.rounded_rect, x, y, w, h, r, width, color))
+            return
+        display = self._display
+        buf = display.linebuffer
+        _fill(buf, color, len(buf) // 2, 0)
+        _draw_rrect(display, buf, x, y, w, h, r, width)
+
+    def polygon(self, points, width=0, color=None):
+        """Draw a convex polygon.
+
+        Example:
+
+        .. code-block:: python
+
+            draw = wasp.watch.drawable
+            draw.polygon(((120, 20), (220, 200), (20, 200)), 0, 0xffe0)
+
+        :param points: Sequence of (x, y) tuples, one for each vertex
+        :param width: Width of the outline in pixels, 0 for a filled polygon
+        :param color: Colour to draw polygon, defaults to the foreground colour
+        """
+        if width:
+            segments = []
+            (xa, ya) = points[-1]
+            for (xb, yb) in points:
+                segments.append((xa, ya, xb, yb))
+                (xa, ya) = (xb, yb)
+            self.lines(segments, width, color)
+            return
+
+        if color is None:
+            color = self._bgfg & 0xffff
+        if self._batch is not None:
+            x0 = min(p[0] for p in points)
+            y0 = min(p[1] for p in points)
+            self._record(x0, y0, max(p[0] for p in points) - x0 + 1,
+                         max(p[1] for p in points) - y0 + 1, _SHAPE,
+                         (self.polygon, points, 0, color))
+            return
+        display = self._display
+        buf = display.linebuffer
+        _fill(buf, color, len(buf) // 2, 0)
+        _draw_polygon(display, buf, points)
+
     def lighten(self, color, step=1):
         """Get a lighter shade from the same palette.
 
@@ -522,3 +1538,150 @@ class Draw565(object):
         b = bm - step if bm > step else 0
 
         return (r | g | b)
+
+class _Surface():
+    """Display driver that renders into RAM rather than onto a panel.
+
+    The surface implements enough of the display driver interface for
+    :py:class:`Draw565` to draw into it. Coordinates are the same as the
+    display's so the surface covers a rectangle of the display and
+    anything drawn outside this rectangle is clipped.
+    """
+    def __init__(self, display, x, y, width, height):
+        self.linebuffer = display.linebuffer
+        self.buffer = memoryview(bytearray(2 * width * height))
+        self._size = (width, height)
+        self.move(x, y)
+
+    def move(self, x, y):
+        self.origin = (x, y)
+        self.width = x + self._size[0]
+        self.height = y + self._size[1]
+
+    def set_window(self, x, y, width, height):
+        (ox, oy) = self.origin
+        self._window = (x - ox, y - oy, width)
+        self._pos = 0
+
+    @micropython.native
+    def write_data(self, buf):
+        (x, y, w) = self._window
+        (cw, ch) = self._size
+        fb = self.buffer
+        pos = self._pos
+        n = len(buf) // 2
+        i = 0
+        while i < n:
+            col = pos % w
+            py = y + pos // w
+            count = min(w - col, n - i)
+            if 0 <= py < ch:
+                a = max(x + col, 0)
+                b = min(x + col + count, cw)
+                if a < b:
+                    src = 2 * (i + a - x - col)
+                    dst = 2 * (py * cw + a)
+                    sz = 2 * (b - a)
+                    fb[dst:dst+sz] = buf[src:src+sz]
+            i += count
+            pos += count
+        self._pos = pos
+
+    quick_write = write_data
+
+    def quick_start(self):
+        pass
+
+    def quick_end(self):
+        pass
+
+class Canvas(Draw565):
+    """Off-screen drawing surface.
+
+    A canvas has the same drawing methods as :py:class:`Draw565` but
+    renders into a RAM buffer covering a rectangle of the display.
+    Once composed, the whole rectangle is sent to the display in a
+    single window by calling :py:meth:`~.flush`. This avoids flicker
+    when drawing layered content and replaces many small windows with
+    one large one.
+
+    Coordinates are the same as the display's (anything outside the
+    canvas is clipped) so existing drawing code can render into a
+    canvas unmodified. The buffer requires 2 bytes per pixel so canvases
+    should be kept small (or short-lived).
+
+    Example:
+
+    .. code-block:: python
+
+        canvas = draw565.Canvas(wasp.watch.display, 0, 0, 240, 32)
+        canvas.fill(0x001f)
+        canvas.string('Hello', 0, 4, width=240)
+        canvas.flush()
+
+    .. automethod:: __init__
+    """
+
+    def __init__(self, display, x, y, width, height, parent=None,
+                 glyph_cache=0):
+        """Allocate a canvas.
+
+        :param display: Display driver that the canvas is flushed to
+        :param x:       X coordinate of the left edge of the canvas
+        :param y:       Y coordinate of the top edge of the canvas
+        :param width:   Width of the canvas
+        :param height:  Height of the canvas
+        :param parent:  Optional :py:class:`Draw565` that the canvas is
+                        standing in for. The canvas starts with the
+                        parent's colours and font and hands them back
+                        when it is flushed.
+        :param int glyph_cache: Size, in bytes, of the glyph cache
+        """
+        self._target = display
+        self._parent = parent
+        super().__init__(_Surface(display, x, y, width, height), glyph_cache)
+
+    def reset(self):
+        """Restore the colours and font.
+
+        A canvas with a parent takes the parent's colours and font,
+        otherwise the defaults are used. Any batch that is still open
+        will be discarded.
+        """
+        super().reset()
+        parent = self._parent
+        if parent:
+            self._bgfg = parent._bgfg
+            self._font = parent._font
+
+    def move(self, x, y):
+        """Move the canvas to a different part of the display.
+
+        The contents of the canvas are not changed, allowing a canvas to
+        be reused to draw several tiles of the same size.
+
+        :param x: X coordinate of the left edge of the canvas
+        :param y: Y coordinate of the top edge of the canvas
+        """
+        self._display.move(x, y)
+
+    def flush(self):
+        """Copy the canvas to the display using a single window.
+
+        If the parent has a batch open then the copy is recorded in the
+        batch and happens, in order, when the batch is committed. The
+        canvas must not be redrawn before then.
+        """
+        surface = self._display
+        (x, y) = surface.origin
+        (w, h) = surface._size
+        parent = self._parent
+        if parent and parent._batch is not None:
+            parent._record(x, y, w, h, _RAWBLIT,
+                           (self._target.rawblit, surface.buffer))
+        else:
+            self._target.rawblit(surface.buffer, x, y, w, h)
+
+        if parent:
+            parent._bgfg = self._bgfg
+            parent._font = self._font
@@ -20,6 +20,7 @@ from time import sleep_ms
 _SWRESET            = const(0x01)
 _SLPIN              = const(0x10)
 _SLPOUT             = const(0x11)
+_PTLON              = const(0x12)
 _NORON              = const(0x13)
 _INVOFF             = const(0x20)
 _INVON              = const(0x21)
@@ -28,24 +29,93 @@ _DISPON             = const(0x29)
 _CASET              = const(0x2a)
 _RASET              = const(0x2b)
 _RAMWR              = const(0x2c)
+_PTLAR              = const(0x30)
+_VSCRDEF            = const(0x33)
+_VSCSAD             = const(0x37)
+_IDMOFF             = const(0x38)
+_IDMON              = const(0x39)
 _COLMOD             = const(0x3a)
 _MADCTL             = const(0x36)
 
+# The frame memory has more lines than the panel
+_FRAME_LINES        = const(320)
+
+# Fills smaller than this are not worth switching to 12-bit mode for
+_MIN_RGB444         = const(64)
+
+@micropython.viper
+def _fill(mv, color: int, count: int):
+    p = ptr16(mv)
+    color = (color >> 8) + ((color & 0xff) << 8)
+
+    for x in range(count):
+        p[x] = color
+
+@micropython.viper
+def _fill444(mv, color: int, count: int):
+    """Fill a buffer with count pairs of RGB444 pixels."""
+    p = ptr8(mv)
+    b0 = color >> 4
+    b1 = ((color & 0xf) << 4) | (color >> 8)
+    b2 = color & 0xff
+
+    for i in range(0, 3 * count, 3):
+        p[i] = b0
+        p[i+1] = b1
+        p[i+2] = b2
+
+@micropython.viper
+def _pack444(mv, count: int, little: int) -> int:
+    """Convert count RGB565 pixels to packed RGB444 (in place).
+
+    Pairs of pixels are read before they are overwritten and the packed
+    data is shorter than the original so the conversion can safely be
+    performed in place.
+
+    :returns: Number of bytes of packed data
+    """
+    p = ptr8(mv)
+    o = 0
+    for i in range(0, 2 * count, 4):
+        if little:
+            c0 = p[i] | (p[i+1] << 8)
+            c1 = p[i+2] | (p[i+3] << 8)
+        else:
+            c0 = (p[i] << 8) | p[i+1]
+            c1 = (p[i+2] << 8) | p[i+3]
+        p[o] = ((c0 >> 8) & 0xf0) | ((c0 >> 7) & 0xf)
+        p[o+1] = ((c0 << 3) & 0xf0) | (c1 >> 12)
+        p[o+2] = ((c1 >> 3) & 0xf0) | ((c1 >> 1) & 0xf)
+        o += 3
+    return o
+
 class ST7789(object):
     """Sitronix ST7789 display driver
 
     .. automethod:: __init__
     """
-    def __init__(self, width, height):
+    def __init__(self, width, height, lines=1):
         """Configure the size of the display.
 
+        The driver owns a transfer buffer, ``linebuffer``, that is shared
+        by all the drawing code. The buffer holds ``lines`` lines of
+        pixels. A larger buffer costs RAM but allows big areas of the
+        display to be written with fewer SPI transfers.
+
         :param int width: Display width, in pixels
         :param int height: Display height in pixels
+        :param int lines: Height of each transfer buffer, in lines
         """
         self.width = width
         self.height = height
-        self.linebuffer = memoryview(bytearray(2 * width))
-        self.window = bytearray(4)
+        self.linebuffer = memoryview(bytearray(2 * width * lines))
+        self.window = memoryview(bytearray(8))
+        self._caset = self.window[0:4]
+        self._raset = self.window[4:8]
+        self.window_stats = [0, 0, 0]
+        self._cols = -1
+        self._rows = -1
+        self._scroll = None
         self.init_display()
 
     def init_display(self):
@@ -65,6 +135,7 @@ class ST7789(object):
             self.write_cmd(cmd[0])
             if cmd[1]:
                 self.write_data(cmd[1])
+        self.depth = 16
         self.fill(0)
         self.write_cmd(_DISPON)
 
@@ -106,12 +177,212 @@ class ST7789(object):
         else:
             self.write_cmd(_DISPON)
 
+    def partial(self, y=0, height=0):
+        """Restrict the display to a horizontal band.
+
+        In partial mode only the lines from ``y`` to ``y+height-1`` are
+        shown and the rest of the panel is black. The panel does not have
+        to be refreshed outside of the partial area which reduces the
+        power consumed by the display. Calling this method with no
+        arguments returns the display to normal mode.
+
+        :param int y:      Y coordinate of the top-most line of the band
+        :param int height: Height of the band, 0 to leave partial mode
+        """
+        if height:
+            ye = y + height - 1
+            self.write_cmd(_PTLAR)
+            self.write_data(bytes((y >> 8, y & 0xff, ye >> 8, ye & 0xff)))
+            self.write_cmd(_PTLON)
+        else:
+            self.write_cmd(_NORON)
+
+    def idle(self, idle):
+        """Switch the display into idle mode.
+
+        In idle mode only the most significant bit of each colour channel
+        is used (giving eight colours) which reduces the power consumed by
+        the display. The frame memory is not modified so leaving idle mode
+        restores the full colour image.
+
+        :param bool idle: True to enter idle mode, False for normal mode.
+        """
+        if idle:
+            self.write_cmd(_IDMON)
+        else:
+            self.write_cmd(_IDMOFF)
+
+    @staticmethod
+    def rgb444(color):
+        """Convert an RGB565 colour to RGB444.
+
+        RGB444 pixels are expanded to RGB565 by repeating the most significant
+        bits of each channel so only some RGB565 colours (including black,
+        white and the primaries) can be shown exactly in 12-bit mode.
+
+        :param color: Colour in RGB565 format
+        :returns:     Colour in RGB444 format or -1 if the colour cannot be
+                      represented exactly
+        """
+        r = color >> 12
+        g = (color >> 7) & 0xf
+        b = (color >> 1) & 0xf
+        if color != ((((r << 1) | (r >> 3)) << 11) +
+                     (((g << 2) | (g >> 2)) << 5) +
+                      ((b << 1) | (b >> 3))):
+            return -1
+        return (r << 8) + (g << 4) + b
+
+    def set_depth(self, depth):
+        """Set the number of bits used to send each pixel.
+
+        In 16-bit mode (the default) pixels are sent in RGB565 format. In
+        12-bit mode pairs of pixels are packed into three bytes in RGB444
+        format (see :py:meth:`~.pack444`) which reduces the amount of data
+        that must be sent by 25%. This does not change the contents of
+        the frame memory but it must be set before the window is set.
+
+        :param int depth: 16 or 12
+        """
+        if depth != self.depth:
+            self.write_cmd(_COLMOD)
+            self.write_data(b'\x03' if depth == 12 else b'\x05')
+            self.depth = depth
+
+    def pack444(self, buf, count, little=False):
+        """Convert a buffer of RGB565 pixels into RGB444 format, in place.
+
+        :param buf:         Buffer containing the pixels
+        :param int count:   Number of pixels, must be even
+        :param bool little: True if the RGB565 pixels are little endian
+                            (for example, the contents of a BMP file)
+        :returns:           Part of the buffer containing the packed pixels
+        """
+        return buf[0:_pack444(buf, count, little)]
+
+    def set_scroll_area(self, top=0, bottom=0):
+        """Define the area of the display that can be scrolled vertically.
+
+        The scrolling area is every line of the display except for
+        ``top`` lines at the top and ``bottom`` lines at the bottom. The
+        scroll offset is reset to zero (which means every line of the
+        display shows the same line of frame memory). Calling this method
+        with no arguments restores the default (the whole display
+        scrolls).
+
+        :param int top:    Number of fixed lines at the top of the display
+        :param int bottom: Number of fixed lines at the bottom of the display
+        """
+        vsa = self.height - top - bottom
+        bfa = _FRAME_LINES - top - vsa
+        self._scroll = (top, vsa, 0)
+
+        self.write_cmd(_VSCRDEF)
+        self.write_data(bytes((top >> 8, top & 0xff, vsa >> 8, vsa & 0xff,
+                               bfa >> 8, bfa & 0xff)))
+        self._write_scroll(top)
+
+    def scroll(self, offset):
+        """Scroll the scrolling area.
+
+        After scrolling, the line ``y`` of the scrolling area shows the line
+        of frame memory given by :py:meth:`~.frame_row` so apps can scroll
+        by a few lines and then draw just the lines that have been exposed.
+        Scrolling to an offset of zero restores the normal mapping.
+
+        :param int offset: Number of lines to scroll the contents of the
+                           scrolling area upwards
+        """
+        if not self._scroll:
+            if not offset:
+                return
+            self.set_scroll_area()
+
+        (top, vsa, current) = self._scroll
+        offset %= vsa
+        if offset != current:
+            self._scroll = (top, vsa, offset)
+            self._write_scroll(top + offset)
+
+    def frame_row(self, y):
+        """Find the line of frame memory that is shown at line y.
+
+        :param int y: Line of the display
+        :returns:     Line of frame memory to draw to in order to update
+                      the display at line y
+        """
+        if not self._scroll:
+            return y
+        (top, vsa, offset) = self._scroll
+        if top <= y < top + vsa:
+            return top + (y - top + offset) % vsa
+        return y
+
+    def _write_scroll(self, vsp):
+        self.write_cmd(_VSCSAD)
+        self.write_data(bytes((vsp >> 8, vsp & 0xff)))
+
+    @micropython.native
+    def _update_window(self, x, y, width, height):
+        """Work out which address ranges need to be sent to the display.
+
+        The column and row address ranges are remembered so that they
+        only need to be sent if they are different to the previous
+        window. The new ranges are stored in the first and second halves
+        of ``window``.
+
+        :returns: Bitmask of the commands that need to be sent: 1 for
+                  CASET and 2 for RASET
+        """
+        window = self.window
+        stats = self.window_stats
+        stats[0] += 1
+        changed = 0
+
+        xp = x + width - 1
+        cols = (x << 16) + xp
+        if cols != self._cols:
+            self._cols = cols
+            window[0] = x >> 8
+            window[1] = x & 0xff
+            window[2] = xp >> 8
+            window[3] = xp & 0xff
+            stats[1] += 1
+            changed = 1
+
+        yp = y + height - 1
+        rows = (y << 16) + yp
+        if rows != self._rows:
+            self._rows = rows
+            window[4] = y >> 8
+            window[5] = y & 0xff
+            window[6] = yp >> 8
+            window[7] = yp & 0xff
+            stats[2] += 1
+            changed |= 2
+
+        return changed
+
+    def invalidate_window(self):
+        """Forget the cached window.
+
+        This must be called whenever the display may have lost its column
+        and row address ranges (for example after a reset).
+        """
+        self._cols = -1
+        self._rows = -1
+
     @micropython.native
     def set_window(self, x, y, width, height):
         """Set the clipping rectangle.
 
         All writes to the display will be wrapped at the edges of the rectangle.
 
+        The column and row address ranges are cached and are only sent to
+        the display if they have changed. ``window_stats`` counts the
+        number of windows set and the number of column (CASET) and row
+        (RASET) updates actually sent.
+
         :param x:  X coordinate of the left-most pixels of the rectangle
         :param y:  Y coordinate of the top-most pixels of the rectangle
         :param w:  Width of the rectangle, defaults to None (which means select
@@ -119,28 +390,15 @@ class ST7789(object):
         :param h:  Height of the rectangle, defaults to None (which means select
                    the bottom-most pixel of the display)
         """
-        write_cmd = self.write_cmd
-        window = self.window
-        write_data = self.write_data
-
-        xp = x + width - 1
-        yp = y + height - 1
-
-        write_cmd(_CASET)
-        window[0] = x >> 8
-        window[1] = x & 0xff
-        window[2] = xp >> 8
-        window[3] = xp & 0xff
-        write_data(window)
-
-        write_cmd(_RASET)
-        window[0] = y >> 8
-        window[1] = y & 0xff
-        window[2] = yp >> 8
-        window[3] = yp & 0xff
-        write_data(window)
+        changed = self._update_window(x, y, width, height)
 
-        write_cmd(_RAMWR)
+        if changed & 1:
+            self.write_cmd(_CASET)
+            self.write_data(self._caset)
+        if changed & 2:
+            self.write_cmd(_RASET)
+            self.write_data(self._raset)
+        self.write_cmd(_RAMWR)
 
     def rawblit(self, buf, x, y, width, height):
         """Blit raw pixels to the display.
@@ -174,17 +432,35 @@ class ST7789(object):
             w = self.width - x
         if not h:
             h = self.height - y
+        buf = self.linebuffer
+        remaining = w * h
+
+        # Large fills (with an even number of pixels) are sent in 12-bit
+        # mode if the colour can be represented exactly
+        c = self.rgb444(bg)
+        if c >= 0 and remaining >= _MIN_RGB444 and not remaining & 1:
+            self.set_depth(12)
+            self.set_window(x, y, w, h)
+            sz = min(len(buf) // 3, remaining // 2)
+            _fill444(buf, c, sz)
+            self._repeat(buf[0:3*sz], 3 * remaining // 2)
+            self.set_depth(16)
+            return
+
+        # Populate the transfer buffer (but only as much of it as we need)
         self.set_window(x, y, w, h)
-
-        # Populate the line buffer
-        buf = self.linebuffer[0:2*w]
-        for xi in range(0, 2*w, 2):
-            buf[xi] = bg >> 8
-            buf[xi+1] = bg & 0xff
-
-        # Do the fill
-        for yi in range(h):
+        sz = min(len(buf) // 2, remaining)
+        _fill(buf, bg, sz)
+        self._repeat(buf[0:2*sz], 2 * remaining)
+
+    def _repeat(self, buf, nbytes):
+        """Send the contents of buf repeatedly until nbytes have been sent."""
+        sz = len(buf)
+        while nbytes >= sz:
             self.write_data(buf)
+            nbytes -= sz
+        if nbytes:
+            self.write_data(buf[0:nbytes])
 
 class ST7789_SPI(ST7789):
     """
@@ -195,7 +471,8 @@ class ST7789_SPI(ST7789):
         :param bytes-like buf: Data, must be in a form that can be directly
                                consumed by the SPI bus.
     """
-    def __init__(self, width, height, spi, cs, dc, res=None, rate=8000000):
+    def __init__(self, width, height, spi, cs, dc, res=None, rate=8000000,
+                 lines=1):
         """Configure the display.
 
         :param int width: Width of the display
@@ -207,10 +484,13 @@ class ST7789_SPI(ST7789):
         :param machine.Pin res: Pin (or signal) to, optionally, use to reset
                                 the display.
         :param int rate: SPI bus frequency
+        :param int lines: Height of each transfer buffer, in lines
         """
         self.quick_write = spi.write
         self.cs = cs.value
         self.dc = dc.value
+        self._bus = (spi.write, cs.value, dc.value)
+        self.spi_stats = None
         self.res = res
         self.rate = rate
         self.cmd = bytearray(1)
@@ -221,7 +501,49 @@ class ST7789_SPI(ST7789):
         if res:
             res.init(res.OUT, value=0)
 
-        super().__init__(width, height)
+        super().__init__(width, height, lines)
+
+    def instrument(self, enable=True):
+        """Count the traffic sent to the display.
+
+        When enabled ``spi_stats`` contains the number of bytes sent, the
+        number of SPI transfers, the number of chip select cycles and the
+        number of commands sent since instrumentation was enabled. This
+        works by wrapping the bus accessors so there is no overhead when
+        instrumentation is disabled.
+
+        :param bool enable: True to start counting (the counters are reset),
+                            False to stop counting.
+        """
+        (write, cs, dc) = self._bus
+        if not enable:
+            self.quick_write = write
+            self.cs = cs
+            self.dc = dc
+            self.spi_stats = None
+            return
+
+        stats = [0, 0, 0, 0]
+
+        def quick_write(buf):
+            stats[0] += len(buf)
+            stats[1] += 1
+            write(buf)
+
+        def cs_value(v):
+            if not v:
+                stats[2] += 1
+            cs(v)
+
+        def dc_value(v):
+            if not v:
+                stats[3] += 1
+            dc(v)
+
+        self.quick_write = quick_write
+        self.cs = cs_value
+        self.dc = dc_value
+        self.spi_stats = stats
 
     def reset(self):
         """Reset the display.
@@ -236,6 +558,40 @@ class ST7789_SPI(ST7789):
         else:
             self.write_cmd(_SWRESET)
         sleep_ms(125)
+        self.invalidate_window()
+        self._scroll = None
+
+    @micropython.native
+    def set_window(self, x, y, width, height):
+        """Set the clipping rectangle.
+
+        This is the same as :py:meth:`ST7789.set_window` except that all
+        the commands (and their parameters) are sent within a single chip
+        select cycle.
+        """
+        changed = self._update_window(x, y, width, height)
+        dc = self.dc
+        c = self.cmd
+        quick_write = self.quick_write
+
+        self.cs(0)
+        if changed & 1:
+            dc(0)
+            c[0] = _CASET
+            quick_write(c)
+            dc(1)
+            quick_write(self._caset)
+        if changed & 2:
+            dc(0)
+            c[0] = _RASET
+            quick_write(c)
+            dc(1)
+            quick_write(self._raset)
+        dc(0)
+        c[0] = _RAMWR
+        quick_write(c)
+        dc(1)
+        self.cs(1)
 
     @micropython.native
     def write_cmd(self, cmd):
@@ -1,20 +1,103 @@
 # SPDX-License-Identifier: LGPL-3.0-or-later
 # Copyright (C) 2020 Daniel Thompson
 
+import micropython
+
 import fonts.sans18 as sans18
 import fonts.sans24 as sans24
 import fonts.sans28 as sans28
 import fonts.sans36 as sans36
 
-def height(font):
-    return font.height()
+_tables = {}
+
+@micropython.viper
+def _measure(table, s, lohi: int) -> int:
+    widths = ptr8(table)
+    lo = lohi & 0xffff
+    hi = lohi >> 16
 
-def width(font, s):
     w = 0
     for ch in s:
-        (_, _, wc) = font.get_ch(ch)
-        w += wc + 1
-
+        oc = int(ord(ch))
+        if oc >= lo and oc <= hi:
+            w += widths[oc - lo + 1]
+        else:
+            w += widths[0]
     return w
 
+@micropython.viper
+def _fit(table, s, width: int, lohi: int) -> int:
+    widths = ptr8(table)
+    lo = lohi & 0xffff
+    hi = lohi >> 16
+
+    w = 0
+    n = 0
+    for ch in s:
+        oc = int(ord(ch))
+        if oc >= lo and oc <= hi:
+            w += widths[oc - lo + 1]
+        else:
+            w += widths[0]
+        if w > width:
+            break
+        n += 1
+    return n
+
+def height(font):
+    return font.height()
+
+def widths(font):
+    """Get the advance width of every glyph in a font.
+
+    Fonts processed by ``tools/font_widths.py`` include a precomputed
+    table. For other fonts the table is calculated (and cached) the first
+    time it is needed.
+
+    :returns: Table of widths, including the spacing column, indexed in
+              the same way as the font (index 0 is the width of the glyph
+              used for missing characters and index n is the width of
+              ``chr(font.min_ch() + n - 1)``)
+    """
+    try:
+        return font.widths()
+    except AttributeError:
+        pass
+
+    try:
+        return _tables[font]
+    except KeyError:
+        pass
+
+    lo = font.min_ch()
+    table = bytearray(font.max_ch() - lo + 2)
+    table[0] = font.get_ch(chr(0))[2] + 1
+    for i in range(1, len(table)):
+        table[i] = font.get_ch(chr(lo + i - 1))[2] + 1
+    table = bytes(table)
+    _tables[font] = table
+    return table
 
+def measure(font, s):
+    """Measure the width of a string.
+
+    :param font: Font to measure the string with
+    :param s:    String to measure
+    :returns:    Width of the string in pixels
+    """
+    return _measure(widths(font), s, font.min_ch() + (font.max_ch() << 16))
+
+def fit(font, s, width):
+    """Find how many characters of a string fit within a given width.
+
+    :param font:  Font to measure the string with
+    :param s:     String to measure
+    :param width: Width available, in pixels
+    :returns:     Number of characters (from the start of the string) that
+                  will fit
+    """
+    return _fit(widths(font), s, width,
+                font.min_ch() + (font.max_ch() << 16))
+
+def width(font, s):
+    return measure(font, s)
@@ -249,6 +249,17 @@ b'\xae\x0a\xd4\x0a\xfa\x0a\x20\x0b\x34\x0b\x48\x0b\x5c\x0b\x82\x0b'\
 b'\xa8\x0b\xce\x0b\xf4\x0b\x1a\x0c\x40\x0c\x66\x0c\x7a\x0c\xa0\x0c'\
 b'\xc6\x0c'
 
+_widths =\
+b'\x0b\x07\x08\x09\x10\x0c\x12\x0e\x05\x08\x08\x0a\x10\x07\x08\x07'\
+b'\x07\x0c\x0c\x0c\x0c\x0c\x0c\x0c\x0c\x0c\x0c\x07\x07\x10\x10\x10'\
+b'\x0b\x13\x0d\x0d\x0e\x0f\x0c\x0b\x0f\x0f\x07\x08\x0e\x0b\x11\x0f'\
+b'\x0f\x0c\x0f\x0e\x0c\x0d\x0f\x0d\x14\x0e\x0d\x0e\x08\x07\x08\x10'\
+b'\x0a\x0a\x0b\x0c\x0a\x0c\x0c\x08\x0c\x0c\x06\x06\x0c\x06\x12\x0c'\
+b'\x0c\x0c\x0c\x09\x09\x08\x0c\x0c\x11\x0c\x0c\x0a\x0c\x07\x0c\x10'
+
+def widths():
+    return _widths
+
 _mvfont = memoryview(_font)
 _mvi = memoryview(_index)
 ifb = lambda l : l[0] | (l[1] << 8)
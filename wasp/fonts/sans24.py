@@ -353,6 +353,17 @@ b'\x18\x10\x4a\x10\x7c\x10\xae\x10\xe0\x10\x12\x11\x44\x11\x76\x11'\
 b'\xa8\x11\xf2\x11\x24\x12\x56\x12\x88\x12\xba\x12\xd4\x12\x06\x13'\
 b'\x50\x13'
 
+_widths =\
+b'\x0d\x08\x0a\x0c\x14\x10\x17\x13\x07\x0a\x0a\x0d\x14\x08\x09\x08'\
+b'\x09\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x09\x09\x14\x14\x14'\
+b'\x0d\x18\x11\x11\x11\x13\x10\x0e\x13\x12\x08\x09\x10\x0e\x15\x12'\
+b'\x13\x0f\x13\x11\x10\x0f\x12\x11\x18\x11\x0f\x11\x0a\x09\x0a\x14'\
+b'\x0d\x0d\x0f\x10\x0e\x10\x0f\x0a\x10\x10\x07\x08\x0e\x07\x17\x10'\
+b'\x0f\x0f\x0f\x0a\x0d\x0a\x10\x0f\x14\x0f\x0f\x0d\x10\x09\x10\x14'
+
+def widths():
+    return _widths
+
 _mvfont = memoryview(_font)
 _mvi = memoryview(_index)
 
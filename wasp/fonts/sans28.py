@@ -104,6 +104,13 @@ b'\x00\x00\x38\x00\x00\x00\xa6\x00\x00\x00\x00\x00\xde\x00\x31\x01'\
 b'\x84\x01\xd7\x01\x2a\x02\x7d\x02\xd0\x02\x23\x03\x76\x03\xc9\x03'\
 b'\x1c\x04\x54\x04'
 
+_widths =\
+b'\x0d\x20\x0d\x0e\x0d\x0d\x19\x19\x19\x19\x19\x19\x19\x19\x19\x19'\
+b'\x0d'
+
+def widths():
+    return _widths
+
 _mvfont = memoryview(_font)
 _mvi = memoryview(_index)
 ifb = lambda l : l[0] | (l[1] << 8)
@@ -153,6 +153,13 @@ b'\x00\x00\x4a\x00\x00\x00\x00\x01\x00\x00\x00\x00\x6e\x01\x00\x02'\
 b'\x92\x02\x24\x03\xb6\x03\x48\x04\xda\x04\x6c\x05\xfe\x05\x90\x06'\
 b'\x22\x07\x6c\x07'
 
+_widths =\
+b'\x11\x28\x11\x12\x11\x11\x1f\x1f\x1f\x1f\x1f\x1f\x1f\x1f\x1f\x1f'\
+b'\x11'
+
+def widths():
+    return _widths
+
 _mvfont = memoryview(_font)
 _mvi = memoryview(_index)
 ifb = lambda l : l[0] | (l[1] << 8)
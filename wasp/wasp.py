@@ -130,8 +130,14 @@ class Manager():
         )
 
         self.blank_after = 15
+        self.always_on = False
 
         self._alarms = []
+        self._always_on = None
+        self._minute = 0
+        self.spi_stats = None
+        self.spi_frame = None
+        self._spi_last = None
         self._brightness = 2
         self._notifylevel = 2
         if 'P8' in watch.os.uname().machine:
@@ -266,8 +272,12 @@ class Manager():
         self.tick_period_ms = 0
         self.tick_expiry = None
 
+        if self.spi_stats is not None:
+            self._account()
+
         self.app = app
         watch.display.mute(True)
+        watch.display.scroll(0)
         watch.drawable.reset()
         app.foreground()
         watch.display.mute(False)
@@ -372,6 +382,83 @@ class Manager():
         self.tick_period_ms = period_ms
         self.tick_expiry = watch.rtc.get_uptime_ms() + period_ms
 
+    def request_always_on(self, y, height):
+        """Keep part of the display visible whilst the watch is asleep.
+
+        This may only be called from an application's sleep() method. If
+        :py:attr:`always_on` is enabled then, rather than switching off the
+        display, the system manager will use the display's low power modes
+        to show the lines from y to y+height-1 (in eight colours and with a
+        dimmed backlight). The application will receive a tick once a
+        minute so that it can update the lines that are shown.
+
+        :param int y:      Y coordinate of the top-most line to keep
+        :param int height: Number of lines to keep
+        :returns:          True if the request was accepted, False otherwise
+        """
+        if self.always_on:
+            self._always_on = (y, height)
+        return self.always_on
+
+    def instrument(self, enable=True):
+        """Measure the display traffic caused by each application.
+
+        When enabled, ``spi_stats`` is a dictionary, keyed on the name of
+        the application, where each entry is a list of the number of frames
+        that updated the display, the number of bytes sent, the number of
+        SPI transfers, the number of chip select cycles, the number of
+        commands, the number of windows and the most bytes sent in a single
+        frame. A frame is a single system tick (or application switch) and
+        ``spi_frame`` records the name and cost of the most recent frame
+        that updated the display.
+
+        The statistics can be read using wasptool::
+
+            ./tools/wasptool --eval 'wasp.system.instrument()'
+            ./tools/wasptool --eval 'wasp.system.spi_report()'
+
+        :param bool enable: True to (re)start measuring, False to stop.
+        """
+        watch.display.instrument(enable)
+        if enable:
+            self.spi_stats = {}
+            self.spi_frame = None
+            self._spi_last = self._spi_counters()
+        else:
+            self.spi_stats = None
+
+    def spi_report(self):
+        """Print the statistics gathered by :py:meth:`~.instrument`."""
+        fmt = '{:12} {:>6} {:>8} {:>6} {:>6} {:>6} {:>6} {:>6}'
+        print(fmt.format('App', 'Frames', 'Bytes', 'Xfers', 'CS', 'Cmds',
+                         'Wins', 'Peak'))
+        for (name, stats) in self.spi_stats.items():
+            print(fmt.format(name, *stats))
+
+    def _spi_counters(self):
+        display = watch.display
+        return display.spi_stats + [display.window_stats[0]]
+
+    def _account(self):
+        """Charge the display traffic since the last call to the current app."""
+        counters = self._spi_counters()
+        frame = [ a - b for (a, b) in zip(counters, self._spi_last) ]
+        self._spi_last = counters
+        if not frame[0]:
+            return
+
+        name = self.app.NAME if 'NAME' in dir(self.app) else '?'
+        stats = self.spi_stats.get(name)
+        if not stats:
+            stats = [0] * 7
+            self.spi_stats[name] = stats
+        stats[0] += 1
+        for i in range(5):
+            stats[i+1] += frame[i]
+        if frame[0] > stats[6]:
+            stats[6] = frame[0]
+        self.spi_frame = (name, frame)
+
     def keep_awake(self):
         """Reset the keep awake timer."""
         self.sleep_at = watch.rtc.uptime + self.blank_after
@@ -380,10 +467,18 @@ class Manager():
         """Enter the deepest sleep state possible.
         """
         watch.backlight.set(0)
+        self._always_on = None
         if 'sleep' not in dir(self.app) or not self.app.sleep():
             self.switch(self.quick_ring[0])
+            self._always_on = None
             self.app.sleep()
-        watch.display.poweroff()
+        if self._always_on:
+            watch.display.partial(*self._always_on)
+            watch.display.idle(True)
+            watch.backlight.set(1)
+            self._minute = watch.rtc.time() // 60
+        else:
+            watch.display.poweroff()
         watch.touch.sleep()
         self._charging = watch.battery.charging()
         self.sleep_at = None
@@ -392,7 +487,12 @@ class Manager():
         """Return to a running state.
         """
         if not self.sleep_at:
-            watch.display.poweron()
+            if self._always_on:
+                watch.display.idle(False)
+                watch.display.partial()
+                self._always_on = None
+            else:
+                watch.display.poweron()
             if 'wake' in dir(self.app):
                 self.app.wake()
             watch.backlight.set(self._brightness)
@@ -489,10 +589,19 @@ class Manager():
 
             gc.collect()
         else:
+            if update and self._always_on:
+                minute = rtc.time() // 60
+                if minute != self._minute:
+                    self._minute = minute
+                    self.app.tick(1)
+
             if 1 == self._button.get_event() or \
                     self._charging != watch.battery.charging():
                 self.wake()
 
+        if self.spi_stats is not None:
+            self._account()
+
     def run(self, no_except=True):
         """Run the system manager synchronously.
 
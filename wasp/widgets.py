@@ -8,6 +8,7 @@ The widget library allows common fragments of logic and drawing code to be
 shared between applications.
 """
 
+import draw565
 import fonts
 import icons
 import wasp
@@ -24,18 +25,21 @@ class BatteryMeter:
     def __init__(self):
         self.level = -2
 
-    def draw(self):
+    def draw(self, draw=None):
         """Draw from meter (from scratch)."""
         self.level = -2
-        self.update()
+        self.update(draw)
 
-    def update(self):
+    def update(self, draw=None):
         """Update the meter.
 
         The update is lazy and won't redraw unless the level has changed.
+
+        :param draw: Drawable to update, defaults to ``watch.drawable``
         """
         icon = icons.battery
-        draw = watch.drawable
+        if draw is None:
+            draw = watch.drawable
 
         if watch.battery.charging():
             if self.level != -1:
@@ -78,21 +82,22 @@ class Clock:
         self.on_screen = None
         self.enabled = enabled
 
-    def draw(self):
+    def draw(self, draw=None):
         """Redraw the clock from scratch.
 
         The container is required to clear the canvas prior to the redraw
         and the clock is only drawn if it is enabled.
         """
         self.on_screen = None
-        self.update()
+        self.update(draw)
 
-    def update(self):
+    def update(self, draw=None):
         """Update the clock widget if needed.
 
         This is a lazy update that only redraws if the time has changes
         since the last call *and* the clock is enabled.
 
+        :param draw: Drawable to update, defaults to ``watch.drawable``
         :returns: An time tuple if the time has changed since the last call,
                   None otherwise.
         """
@@ -106,7 +111,8 @@ class Clock:
                 or now[4] != on_screen[4] or now[3] != on_screen[3]):
             t1 = '{:02}:{:02}'.format(now[3], now[4])
 
-            draw = wasp.watch.drawable
+            if draw is None:
+                draw = wasp.watch.drawable
             draw.set_font(fonts.sans28)
             draw.set_color(wasp.system.theme('status-clock'))
             draw.string(t1, 52, 4, 138)
@@ -156,6 +162,7 @@ class StatusBar:
         self._clock = Clock()
         self._meter = BatteryMeter()
         self._notif = NotificationBar()
+        self._canvas = None
 
     @property
     def clock(self):
@@ -169,10 +176,32 @@ class StatusBar:
         self._clock.enabled = enabled
 
     def draw(self):
-        """Redraw the status bar from scratch."""
-        self._clock.draw()
-        self._meter.draw()
+        """Redraw the status bar from scratch.
+
+        Boards with RAM to spare can define ``statusbar_canvas`` in their
+        watch module. The clock and battery meter are then composed
+        off-screen and sent to the display in a single window. The canvas
+        (12 KB) is allocated by the first redraw and then kept. Other
+        boards draw the status bar directly.
+        """
+        canvas = self._canvas
+        if not canvas and 'statusbar_canvas' in dir(watch):
+            try:
+                canvas = draw565.Canvas(watch.display, 52, 0, 188, 32,
+                                        watch.drawable)
+                self._canvas = canvas
+            except MemoryError:
+                canvas = None
+
+        if canvas:
+            canvas.reset()
+            if not self._clock.enabled:
+                canvas.fill(0, 52, 0, 138, 32)
+        self._clock.draw(canvas)
+        self._meter.draw(canvas)
         self._notif.draw()
+        if canvas:
+            canvas.flush()
 
     def update(self):
         """Lazily update the status bar.